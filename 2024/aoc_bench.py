@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import NamedTuple
+
+from aoc_run import INPUT_FILE, ROOT, discover_days, load_day, solve
+
+BASELINE_DIR = ROOT / "benchmarks"
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+
+class Stats(NamedTuple):
+    median: float
+    p95: float
+    stdev: float
+    best: float
+    runs: int
+
+
+def machine_id() -> str:
+    node = platform.node().split(".")[0] or "unknown"
+    return f"{node}-{platform.system()}-{platform.machine()}".lower()
+
+
+def summarize(timings: list[float]) -> Stats:
+    # quantiles needs at least two data points
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    stdev = statistics.stdev(timings) if len(timings) > 1 else 0.0
+    return Stats(
+        median=statistics.median(timings),
+        p95=p95,
+        stdev=stdev,
+        best=min(timings),
+        runs=len(timings),
+    )
+
+
+def clear_caches(module) -> None:
+    """Reset functools caches so every timed run solves from scratch."""
+    for value in vars(module).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def bench_part(
+    module, day: int, part: int, data: str, warmup: int, repeat: int
+) -> Stats | None:
+    if not hasattr(module, f"solve_part{part}"):
+        return None
+
+    timings = []
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for _ in range(warmup):
+            clear_caches(module)
+            solve(module, day, part, data)
+        for _ in range(repeat):
+            clear_caches(module)
+            start = time.perf_counter()
+            solve(module, day, part, data)
+            timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def run_benchmarks(
+    days: list[int] | None, warmup: int, repeat: int
+) -> dict[str, Stats]:
+    results = {}
+    for day, script in discover_days(days).items():
+        input_path = script.parent / INPUT_FILE
+        if not input_path.exists():
+            print(f"day {day:02}: no {INPUT_FILE}, skipping")
+            continue
+
+        module = load_day(script)
+        data = input_path.read_text().strip()
+        for part in (1, 2):
+            try:
+                stats = bench_part(module, day, part, data, warmup, repeat)
+            except Exception as exc:
+                print(f"day {day:02} part {part}: {type(exc).__name__}: {exc}")
+                continue
+            if stats is not None:
+                results[f"{day:02}.{part}"] = stats
+    return results
+
+
+def load_baseline(path: Path) -> dict[str, Stats]:
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text())
+    return {key: Stats(**value) for key, value in raw["results"].items()}
+
+
+def save_baseline(path: Path, results: dict[str, Stats]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "machine": machine_id(),
+        "python": platform.python_version(),
+        "results": {key: stats._asdict() for key, stats in sorted(results.items())},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def compare(
+    results: dict[str, Stats], baseline: dict[str, Stats], threshold: float
+) -> list[str]:
+    print(
+        f"{'bench':>6}  {'median':>10}  {'p95':>10}  {'stdev':>10}  "
+        f"{'baseline':>10}  {'change':>8}"
+    )
+    regressions = []
+    for key, stats in sorted(results.items()):
+        line = f"{key:>6}  {stats.median:>10.6f}  {stats.p95:>10.6f}  "
+        line += f"{stats.stdev:>10.6f}"
+        if (base := baseline.get(key)) is not None:
+            change = stats.median / base.median - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(key)
+            line += f"  {base.median:>10.6f}  {change:>+8.1%}{flag}"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Advent of Code days")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default all)")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative median slowdown flagged as regression (default 0.10)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_DIR / f"{machine_id()}.json",
+        help="baseline file (default one per machine)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the new baseline"
+    )
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = run_benchmarks(args.days, args.warmup, args.repeat)
+    baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        # merge so benchmarking a subset of days keeps the other baselines
+        save_baseline(args.baseline, baseline | results)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
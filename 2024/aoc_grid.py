@@ -0,0 +1,103 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+NEWLINE = ord("\n")
+
+
+class Grid:
+    """
+    2D grid stored as one flat bytearray, one byte per cell.
+
+    Rows keep their trailing newline so the raw puzzle input can be used as is:
+    cell (r, c) lives at r * stride + c and the newline column acts as a
+    sentinel, stepping east or west off a row never wraps into the next one.
+    """
+
+    __slots__ = ("cells", "width", "height", "stride", "offsets")
+
+    def __init__(self, data: bytes | bytearray | str):
+        if isinstance(data, str):
+            data = data.encode()
+        # a bytearray is adopted as is, anything else is copied once
+        self.cells = data if isinstance(data, bytearray) else bytearray(data)
+        self._normalise_trailing_newline()
+
+        self.width = self.cells.find(NEWLINE)
+        self.stride = self.width + 1
+        self.height = len(self.cells) // self.stride
+        # every newline has to sit in the sentinel column, one per row
+        newlines = self.cells[self.width :: self.stride].count(NEWLINE)
+        if not newlines == self.cells.count(NEWLINE) == self.height:
+            raise ValueError("Grid rows must all have the same length")
+        # north, east, south, west
+        self.offsets = (-self.stride, 1, self.stride, -1)
+
+    @classmethod
+    def from_file(cls, path: Path | str) -> "Grid":
+        with open(path, "rb") as f:
+            cells = bytearray(Path(path).stat().st_size)
+            f.readinto(cells)
+        return cls(cells)
+
+    @classmethod
+    def filled(cls, width: int, height: int, char: str = ".") -> "Grid":
+        return cls((char * width + "\n") * height)
+
+    def _normalise_trailing_newline(self) -> None:
+        end = len(self.cells)
+        while end and self.cells[end - 1] == NEWLINE:
+            end -= 1
+        del self.cells[end:]
+        self.cells.append(NEWLINE)
+
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: int) -> None:
+        self.cells[i] = value
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __str__(self) -> str:
+        return self.cells.decode().rstrip("\n")
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy())
+
+    def index(self, r: int, c: int) -> int:
+        return r * self.stride + c
+
+    def position(self, i: int) -> tuple[int, int]:
+        return divmod(i, self.stride)
+
+    def in_bounds(self, i: int) -> bool:
+        return 0 <= i < len(self.cells) and self.cells[i] != NEWLINE
+
+    def neighbours(self, i: int) -> Iterator[int]:
+        for offset in self.offsets:
+            if self.in_bounds(n := i + offset):
+                yield n
+
+    def indices(self) -> Iterator[int]:
+        for start in range(0, len(self.cells), self.stride):
+            yield from range(start, start + self.width)
+
+    def rows(self) -> Iterator[bytearray]:
+        for start in range(0, len(self.cells), self.stride):
+            yield self.cells[start : start + self.width]
+
+    def find(self, char: str) -> int:
+        i = self.cells.find(char.encode())
+        if i == -1:
+            raise ValueError(f"{char} not found in grid")
+        return i
+
+    def find_all(self, char: str) -> list[int]:
+        needle = char.encode()
+        found = []
+        i = self.cells.find(needle)
+        while i != -1:
+            found.append(i)
+            i = self.cells.find(needle, i + 1)
+        return found
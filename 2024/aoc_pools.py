@@ -0,0 +1,171 @@
+import argparse
+import sys
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from aoc_bench import Stats, summarize
+from aoc_run import INPUT_FILE, discover_days, load_day
+
+DEFAULT_WORKERS = (1, 2, 4, 8)
+DEFAULT_CHUNKSIZE = 1
+DEFAULT_REPEAT = 3
+
+
+class Timing(NamedTuple):
+    backend: str
+    workers: int
+    chunksize: int
+    stats: Stats
+    speedup: float
+
+
+def gil_enabled() -> bool:
+    # only free-threaded builds (3.13t) can switch the GIL off
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def backends() -> tuple[str, ...]:
+    """
+    Threads only run Python code in parallel without the GIL, so on a
+    free-threaded build they are reported as a backend of their own.
+    """
+    if gil_enabled():
+        return ("thread", "process")
+    return ("free-thread", "process")
+
+
+def _executor(backend: str, workers: int, script: Path | None) -> Executor:
+    if backend == "process":
+        # spawn and forkserver workers don't inherit the parent's sys.modules,
+        # they have to load the day themselves before func and the work items
+        # (pickled by reference to the day module) can be unpickled
+        if script is None:
+            return ProcessPoolExecutor(max_workers=workers)
+        return ProcessPoolExecutor(
+            max_workers=workers, initializer=load_day, initargs=(script,)
+        )
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def run_backend(
+    backend: str,
+    func: Callable[[Any], Any],
+    work: list[Any],
+    workers: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    script: Path | None = None,
+) -> list[Any]:
+    """
+    Run func over the work list. Pass the day script func comes from when it
+    was loaded with aoc_run.load_day, so process pool workers can load it too.
+    """
+    if backend == "serial":
+        return list(map(func, work))
+    # chunksize only batches submissions for process pools
+    with _executor(backend, workers, script) as executor:
+        return list(executor.map(func, work, chunksize=chunksize))
+
+
+def time_backend(
+    backend: str,
+    func: Callable[[Any], Any],
+    work: list[Any],
+    workers: int,
+    chunksize: int,
+    repeat: int,
+    script: Path | None = None,
+) -> tuple[list[Any], Stats]:
+    timings = []
+    for _ in range(repeat):
+        # pool start up is part of the price of picking a backend
+        start = time.perf_counter()
+        results = run_backend(backend, func, work, workers, chunksize, script)
+        timings.append(time.perf_counter() - start)
+    return results, summarize(timings)
+
+
+def compare_executors(
+    func: Callable[[Any], Any],
+    work: list[Any],
+    workers: Iterable[int] = DEFAULT_WORKERS,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    repeat: int = DEFAULT_REPEAT,
+    script: Path | None = None,
+) -> list[Timing]:
+    """
+    Time func over the work list serially and with every pool backend per
+    worker count. Speedups are relative to the serial median. script is the
+    day func was loaded from, see run_backend.
+    """
+    expected, serial = time_backend("serial", func, work, 1, chunksize, repeat)
+    timings = [Timing("serial", 1, chunksize, serial, 1.0)]
+
+    for backend in backends():
+        for count in workers:
+            results, stats = time_backend(
+                backend, func, work, count, chunksize, repeat, script
+            )
+            if results != expected:
+                raise RuntimeError(f"{backend} with {count} workers changed results")
+            speedup = serial.median / stats.median
+            timings.append(Timing(backend, count, chunksize, stats, speedup))
+    return timings
+
+
+def print_timings(timings: list[Timing]) -> None:
+    print(
+        f"{'backend':>11}  {'workers':>7}  {'chunk':>5}  "
+        f"{'median':>10}  {'p95':>10}  {'speedup':>7}"
+    )
+    for t in timings:
+        print(
+            f"{t.backend:>11}  {t.workers:>7}  {t.chunksize:>5}  "
+            f"{t.stats.median:>10.6f}  {t.stats.p95:>10.6f}  {t.speedup:>6.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare executors on a day's work list. Days opt in by "
+        "defining work_items(data) and solve_item(item)."
+    )
+    parser.add_argument("day", type=int)
+    parser.add_argument(
+        "-w", "--workers", type=int, nargs="+", default=list(DEFAULT_WORKERS)
+    )
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help="items per process pool task (default 1)",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args()
+
+    scripts = discover_days([args.day])
+    if not scripts:
+        parser.error(f"day {args.day} not found")
+    script = scripts[args.day]
+    module = load_day(script)
+    if not hasattr(module, "work_items"):
+        parser.error(f"day {args.day} has no work_items/solve_item")
+
+    data = (script.parent / INPUT_FILE).read_text().strip()
+    work = module.work_items(data)
+    print(
+        f"day {args.day:02}: {len(work)} items, "
+        f"GIL {'enabled' if gil_enabled() else 'disabled'}\n"
+    )
+    print_timings(
+        compare_executors(
+            module.solve_item, work, args.workers, args.chunksize, args.repeat, script
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
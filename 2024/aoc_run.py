@@ -0,0 +1,161 @@
+import argparse
+import importlib.util
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+ROOT = Path(__file__).parent
+INPUT_FILE = "input.txt"
+
+# solvers that need puzzle specific arguments next to the input data
+SOLVER_KWARGS: dict[int, dict[str, int]] = {
+    14: {"x": 101, "y": 103},
+    18: {"grid_size": 71, "num_bytes": 1024},
+}
+
+# submitted first so they don't end up as the tail of the pool
+SLOW_DAYS = (6, 14, 18, 20)
+
+
+class DayResult(NamedTuple):
+    day: int
+    part1: Any
+    part2: Any
+    wall_time: float
+    cpu_time: float
+    peak_rss_mb: float
+    error: str | None = None
+
+
+def discover_days(days: list[int] | None = None) -> dict[int, Path]:
+    scripts = {
+        int(script.parent.name.removeprefix("day")): script
+        for script in sorted(ROOT.glob("day[0-9][0-9]/script.py"))
+    }
+    if days:
+        scripts = {day: scripts[day] for day in days if day in scripts}
+    return scripts
+
+
+def load_day(script: Path) -> ModuleType:
+    # days share helper modules that live next to this file
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+    name = script.parent.name
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, script)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {script}")
+    module = importlib.util.module_from_spec(spec)
+    # register the module so its functions and classes pickle by reference;
+    # only fork children inherit this, spawn and forkserver workers have to
+    # call load_day themselves (e.g. as pool initializer)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def solve(module: ModuleType, day: int, part: int, data: str) -> Any:
+    solver = getattr(module, f"solve_part{part}", None)
+    if solver is None:
+        return None
+
+    # day 1 and 2 solve pre-parsed input
+    if hasattr(module, "parse_input"):
+        parsed = module.parse_input(data)
+        args = parsed if isinstance(parsed, tuple) else (parsed,)
+    else:
+        args = (data,)
+
+    return solver(*args, **SOLVER_KWARGS.get(day, {}))
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_day(day: int, script: Path) -> DayResult:
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    results: list[Any] = [None, None]
+    error = None
+
+    try:
+        module = load_day(script)
+        data = (script.parent / INPUT_FILE).read_text().strip()
+        # days print debug output, keep the report readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for part in (1, 2):
+                results[part - 1] = solve(module, day, part, data)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+
+    return DayResult(
+        day,
+        *results,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+        peak_rss_mb=_peak_rss_mb(),
+        error=error,
+    )
+
+
+def run_days(scripts: dict[int, Path], workers: int | None = None) -> list[DayResult]:
+    order = sorted(scripts, key=lambda day: (day not in SLOW_DAYS, day))
+
+    # a fresh process per day so peak RSS is not inherited from a previous day
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1) as executor:
+        futures = [executor.submit(run_day, day, scripts[day]) for day in order]
+        results = [future.result() for future in as_completed(futures)]
+
+    return sorted(results)
+
+
+def print_report(results: list[DayResult], total_time: float) -> None:
+    print(
+        f"{'day':>3}  {'part 1':>20}  {'part 2':>20}  "
+        f"{'wall (s)':>9}  {'cpu (s)':>9}  {'rss (MB)':>9}"
+    )
+    for r in results:
+        if r.error is not None:
+            answers = f"{r.error[:42]:<42}"
+        else:
+            answers = f"{str(r.part1):>20}  {str(r.part2):>20}"
+        print(
+            f"{r.day:>3}  {answers}  "
+            f"{r.wall_time:>9.3f}  {r.cpu_time:>9.3f}  {r.peak_rss_mb:>9.1f}"
+        )
+    print(f"\nTotal wall time: {total_time:.3f}s")
+    print(f"Sum of day wall times: {sum(r.wall_time for r in results):.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Advent of Code days")
+    parser.add_argument("days", nargs="*", type=int, help="days to run (default all)")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="pool size (default cpus)"
+    )
+    args = parser.parse_args()
+
+    scripts = discover_days(args.days)
+    if not scripts:
+        print("No days found.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    results = run_days(scripts, workers=args.workers)
+    print_report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
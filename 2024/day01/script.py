@@ -1,4 +1,5 @@
 from collections import Counter
+from pathlib import Path
 
 
 def parse_input(input_data):
@@ -43,8 +44,7 @@ if __name__ == "__main__":
     assert part2 == 31, f"Expected 31, got {part2}"
 
     # To test with real input file
-    with open("input.txt") as f:
-        input_data = f.read()
+    input_data = (Path(__file__).parent / "input.txt").read_text()
     col1, col2 = parse_input(input_data)
     print(f"Part 1: {solve_part1(col1, col2)}")
     print(f"Part 2: {solve_part2(col1, col2)}")
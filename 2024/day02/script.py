@@ -1,4 +1,5 @@
 from itertools import pairwise
+from pathlib import Path
 
 MAX_DELTA = 3
 
@@ -61,8 +62,7 @@ def main():
     test_examples()
 
     # results for submission
-    with open("input.txt", "r") as f:
-        input_data = f.read()
+    input_data = (Path(__file__).parent / "input.txt").read_text()
     data = parse_input(input_data)
 
     part1 = solve_part1(data)
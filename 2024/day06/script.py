@@ -1,81 +1,119 @@
-from enum import Enum
-from itertools import cycle
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import NamedTuple
 
-# from pprint import pp
+sys.path.append(str(Path(__file__).parent.parent))
 
+from aoc_grid import Grid  # noqa: E402
 
-class Direction(Enum):
-    NORTH = (-1, 0)
-    EAST = (0, 1)
-    SOUTH = (1, 0)
-    WEST = (0, -1)
+OBSTACLES = b"#O"
+EMPTY = ord(".")
+# direction indexes into Grid.offsets, +1 is a right turn
+NORTH, EAST, SOUTH, WEST = range(4)
+# jump target when the guard walks off the map
+EXIT = -1
 
 
-class Position(NamedTuple):
-    x: int
-    y: int
+def parse_grid(grid: str) -> Grid:
+    return Grid(grid)
 
 
-def parse_grid(grid: str) -> list[list[str]]:
-    return [list(row) for row in grid.splitlines()]
+def find_in_grid(grid: Grid, target: str = "^") -> int:
+    return grid.find(target)
 
 
-def find_in_grid(grid: list[list[str]], target: str = "^") -> Position:
-    for i, row in enumerate(grid):
-        for j, cell in enumerate(row):
-            if cell == target:
-                return Position(i, j)
-    raise ValueError(f"{target} not found in grid")
-
-
-def traverse_grid(grid: list[list[str]], start: Position) -> set[Position]:
-    directions = cycle([d.value for d in Direction])
-    direction = next(directions)
-
-    i, j = start
-    processed = set()
+def traverse_grid(grid: Grid, start: int) -> dict[int, tuple[int, int]]:
+    """
+    Walk the guard off the map and map every visited cell to the state
+    (cell, direction) the guard was in right before first entering it.
+    """
+    direction = NORTH
+    i = start
+    processed = {start: (start, direction)}
 
     while True:
-        processed.add(Position(i, j))
-        next_pos = Position(i + direction[0], j + direction[1])
-
-        try:
-            if grid[next_pos.x][next_pos.y] in ("#", "O"):
-                direction = next(directions)
-                continue
-        except IndexError:
-            return processed
-
-        i, j = next_pos
+        next_pos = i + grid.offsets[direction]
 
+        if not grid.in_bounds(next_pos):
+            return processed
 
-def check_infinite_loop(grid: list[list[str]], start: Position) -> bool:
-    directions = cycle([d.value for d in Direction])
-    direction = next(directions)
+        if grid[next_pos] in OBSTACLES:
+            direction = (direction + 1) % 4
+            continue
 
-    i, j = start
+        processed.setdefault(next_pos, (i, direction))
+        i = next_pos
+
+
+def build_jump_table(grid: Grid) -> list[list[int]]:
+    """
+    For every direction and free cell, the cell the guard stops at right before
+    the next obstacle, or EXIT if there is none before the edge of the map.
+    """
+    jumps = [[EXIT] * len(grid.cells) for _ in grid.offsets]
+    rows = [
+        range(r * grid.stride, r * grid.stride + grid.width) for r in range(grid.height)
+    ]
+    cols = [range(c, len(grid.cells), grid.stride) for c in range(grid.width)]
+
+    for direction, lines in ((NORTH, cols), (EAST, rows), (SOUTH, cols), (WEST, rows)):
+        offset = grid.offsets[direction]
+        for line in lines:
+            # sweep against the walking direction, carrying the stop cell along
+            stop = EXIT
+            for i in line if offset < 0 else reversed(line):
+                if grid[i] in OBSTACLES:
+                    stop = i - offset
+                else:
+                    jumps[direction][i] = stop
+
+    return jumps
+
+
+def _jump(
+    jumps: list[list[int]], stride: int, i: int, direction: int, block: int
+) -> int:
+    offset = (-stride, 1, stride, -1)[direction]
+    stop = jumps[direction][i]
+
+    # patch the extra obstruction in if it sits between us and the stop cell
+    if direction in (EAST, WEST):
+        same_line = block // stride == i // stride
+    else:
+        same_line = (block - i) % stride == 0
+    if (
+        same_line
+        and (block - i) * offset > 0
+        and (stop == EXIT or (stop - block) * offset >= 0)
+    ):
+        return block - offset
+
+    return stop
+
+
+def check_infinite_loop(
+    jumps: list[list[int]], stride: int, start: int, direction: int, block: int
+) -> bool:
+    """
+    Teleport the guard from turn to turn with an extra obstruction at `block`,
+    only the states at turns need to be remembered to spot a loop.
+    """
+    i = start
     visited_states = set()
 
     while True:
-        current_state = (Position(i, j), direction)
+        i = _jump(jumps, stride, i, direction, block)
+        if i == EXIT:
+            return False  # Exit grid, no loop
+
+        current_state = i * 4 + direction
         if current_state in visited_states:
             return True  # Infinite loop detected
         visited_states.add(current_state)
 
-        next_pos = Position(i + direction[0], j + direction[1])
-
-        # Check boundaries
-        if not (0 <= next_pos.x < len(grid) and 0 <= next_pos.y < len(grid[0])):
-            return False  # Exit grid, no loop
-
-        # Handle obstacles
-        if grid[next_pos.x][next_pos.y] in ("#", "O"):
-            direction = next(directions)
-            continue
-
-        i, j = next_pos
+        direction = (direction + 1) % 4
 
 
 def solve_part1(data: str) -> int:
@@ -85,29 +123,50 @@ def solve_part1(data: str) -> int:
     return len(processed)
 
 
+def _obstruction_candidates(grid: Grid, start: int) -> list[tuple[int, int, int]]:
+    """(previous cell, direction, obstruction cell) for every cell worth blocking."""
+    processed = traverse_grid(grid, start)
+    return [
+        (previous, direction, cell)
+        for cell, (previous, direction) in processed.items()
+        # Skip the starting position and non-traversable positions
+        if grid[cell] == EMPTY
+    ]
+
+
+def _count_loops(
+    jumps: list[list[int]], stride: int, candidates: list[tuple[int, int, int]]
+) -> int:
+    # The path up to the obstruction is unchanged, so resume from the
+    # state right before the guard would have walked into it
+    return sum(
+        check_infinite_loop(jumps, stride, previous, direction, cell)
+        for previous, direction, cell in candidates
+    )
+
+
 def solve_part2(data: str) -> int:
     grid = parse_grid(data)
     start = find_in_grid(grid)
-    processed = traverse_grid(grid, start)
-    block_positions = 0
+    jumps = build_jump_table(grid)
+    candidates = _obstruction_candidates(grid, start)
+    return _count_loops(jumps, grid.stride, candidates)
 
-    for cell in processed:
-        # Skip the starting position and non-traversable positions
-        if grid[cell.x][cell.y] != ".":
-            continue
 
-        # Place an obstruction and test
-        original_value = grid[cell.x][cell.y]
-        grid[cell.x][cell.y] = "O"
-
-        # Check if the obstruction creates a new loop
-        if check_infinite_loop(grid, start):
-            block_positions += 1
+def solve_part2_parallel(data: str, workers: int | None = None) -> int:
+    grid = parse_grid(data)
+    start = find_in_grid(grid)
+    jumps = build_jump_table(grid)
+    candidates = _obstruction_candidates(grid, start)
 
-        # Revert the obstruction
-        grid[cell.x][cell.y] = original_value
+    # the jump table is never mutated, each worker only gets its own
+    # obstructions to try; striding keeps long and short walks balanced
+    workers = workers or os.cpu_count() or 1
+    chunks = [candidates[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(partial(_count_loops, jumps, grid.stride), chunks)
 
-    return block_positions
+    return sum(results)
 
 
 def main():
@@ -140,6 +199,10 @@ def main():
     print(f"Part 2: {part2_result}")
     assert part2_result == 1670
 
+    part2_result = solve_part2_parallel(input_file)
+    print(f"Part 2 (parallel): {part2_result}")
+    assert part2_result == 1670
+
 
 if __name__ == "__main__":
     main()
@@ -1,16 +1,52 @@
-from functools import cache
-from itertools import product
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import batched
 from operator import add, mul
 from pathlib import Path
 from typing import Callable, Generator, NamedTuple
 
+POWERS_OF_TEN = tuple(10**exponent for exponent in range(1, 20))
+CACHE_SIZE = 100_000
+CHUNK_SIZE = 2_000
+
 
 class Operation(NamedTuple):
     target_result: int
     operations: tuple[int, ...]
 
 
-valid_results = set()
+class SolvedCache:
+    """
+    Equations known to be solvable together with the operators that solved
+    them; any superset of those operators solves them as well, so part 2 can
+    reuse part 1. Holds at most maxsize equations, least recently used first
+    out.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._solved: OrderedDict[Operation, frozenset[Callable]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._solved)
+
+    def solved_by(self, operation: Operation, ops: frozenset[Callable]) -> bool:
+        known = self._solved.get(operation)
+        if known is None or not known <= ops:
+            return False
+        self._solved.move_to_end(operation)
+        return True
+
+    def add(self, operation: Operation, ops: frozenset[Callable]) -> None:
+        self._solved[operation] = ops
+        self._solved.move_to_end(operation)
+        if len(self._solved) > self.maxsize:
+            self._solved.popitem(last=False)
+
+    def clear(self) -> None:
+        self._solved.clear()
 
 
 def parse_data(data: str) -> Generator[Operation, None, None]:
@@ -19,44 +55,154 @@ def parse_data(data: str) -> Generator[Operation, None, None]:
         yield Operation(int(res), tuple(int(o) for o in ops.split()))
 
 
-def solve_part1(data: str, ops: list[Callable] = [add, mul]) -> int:
-    """Solve part 1 of the problem."""
-    parsed_data = parse_data(data)
-    valid = []
-    for operation in parsed_data:
-        # reuse the results we've already seen in case we call this
-        # function multiple times (= reuse part 2)
-        if operation in valid_results:
-            valid.append(operation.target_result)
-            continue
-
-        combos = product(ops, repeat=len(operation.operations) - 1)
-        for combo in combos:
-            result = operation.operations[0]
-            is_valid = True
-
-            for num, op in zip(operation.operations[1:], combo):
-                result = op(result, num)
-                if result > operation.target_result:
-                    is_valid = False
-                    break
-
-            if is_valid and result == operation.target_result:
-                valid.append(operation.target_result)
-                valid_results.add(operation)
-                break
-
-    return sum(valid)
-
-
-@cache
-def concat(left: int, right: int) -> int:
-    return int(f"{left}{right}")
+def _undo_add(target: int, num: int) -> int | None:
+    return target - num if target >= num else None
 
 
-def solve_part2(data: str) -> int:
+def _undo_mul(target: int, num: int) -> int | None:
+    return target // num if num and target % num == 0 else None
+
+
+def _shift(num: int) -> int:
+    """Smallest power of ten above num, what concat scales the left side by."""
+    i = bisect_right(POWERS_OF_TEN, num)
+    if i < len(POWERS_OF_TEN):
+        return POWERS_OF_TEN[i]
+    shift = POWERS_OF_TEN[-1]
+    while shift <= num:
+        shift *= 10
+    return shift
+
+
+def concat(left: int, right: int) -> int:
+    return left * _shift(right) + right
+
+
+def _undo_concat(target: int, num: int) -> int | None:
+    shift = _shift(num)
+    return target // shift if target % shift == num else None
+
+
+UNDO = {add: _undo_add, mul: _undo_mul, concat: _undo_concat}
+
+
+def is_solvable(operation: Operation, ops: list[Callable]) -> bool:
+    """
+    Work right to left from the target: the last number can only have been
+    added if the target is at least as big, multiplied if it divides the
+    target and concatenated if the target ends in its digits. Most branches
+    die right away instead of trying every operator combination.
+    """
+    try:
+        undos = [UNDO[op] for op in ops]
+    except KeyError as exc:
+        raise ValueError(f"No inverse known for {exc.args[0]}") from None
+    numbers = operation.operations
+    bound = operation.target_result
+
+    def search(target: int, count: int) -> bool:
+        if count == 1:
+            return target == numbers[0]
+        num = numbers[count - 1]
+        for undo in undos:
+            previous = undo(target, num)
+            if previous is not None and search(previous, count - 1):
+                return True
+        # x * 0 == 0 for whatever x the numbers before can form
+        return (
+            num == 0
+            and target == 0
+            and mul in ops
+            and bool(_reachable_values(numbers[: count - 1], ops, bound))
+        )
+
+    return search(operation.target_result, len(numbers))
+
+
+def _reachable_values(
+    numbers: tuple[int, ...], ops: list[Callable], bound: int
+) -> set[int]:
+    """
+    Deduplicated values the numbers can form. Like trying every combination,
+    a result above the bound ends that combination, the first number alone
+    is never checked.
+    """
+    first, *rest = numbers
+    values = {first}
+    for num in rest:
+        values = {
+            result
+            for value in values
+            for op in ops
+            if (result := op(value, num)) <= bound
+        }
+    return values
+
+
+def is_reachable(operation: Operation, ops: list[Callable]) -> bool:
+    """Forward breadth first over the set of values reachable per number."""
+    target = operation.target_result
+    return target in _reachable_values(operation.operations, ops, target)
+
+
+METHODS = {"reverse": is_solvable, "forward": is_reachable}
+
+
+def solve_part1(
+    data: str,
+    ops: list[Callable] = [add, mul],
+    method: str = "reverse",
+    cache: SolvedCache | None = None,
+) -> int:
+    """Solve part 1 of the problem."""
+    check = METHODS[method]
+    op_set = frozenset(ops)
+    total = 0
+    for operation in parse_data(data):
+        # a cache shared between calls lets part 2 skip what part 1 solved
+        if cache is not None and cache.solved_by(operation, op_set):
+            total += operation.target_result
+        elif check(operation, ops):
+            total += operation.target_result
+            if cache is not None:
+                cache.add(operation, op_set)
+    return total
+
+
+def solve_part2(
+    data: str, method: str = "reverse", cache: SolvedCache | None = None
+) -> int:
     """Solve part 2 of the problem."""
-    return solve_part1(data, ops=[add, mul, concat])
+    return solve_part1(data, ops=[add, mul, concat], method=method, cache=cache)
+
+
+def _solve_chunk(lines: tuple[str, ...], ops: list[Callable], method: str) -> int:
+    return solve_part1("\n".join(lines), ops=ops, method=method)
+
+
+def solve_parallel(
+    data: str,
+    ops: list[Callable] = [add, mul],
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    method: str = "reverse",
+) -> int:
+    """
+    Equations are independent, so chunks of lines are streamed to a process
+    pool and each one reports its partial sum. Only a couple of chunks per
+    worker are in flight, huge inputs are never queued up all at once.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in batched(data.splitlines(), chunk_size):
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(future.result() for future in done)
+            pending.add(executor.submit(_solve_chunk, chunk, ops, method))
+        total += sum(future.result() for future in pending)
+    return total
 
 
 def main():
@@ -72,18 +218,25 @@ def main():
 292: 11 6 16 20
 """.strip()
     input_file = (Path(__file__).parent / "input.txt").read_text().strip()
+    cache = SolvedCache()
 
     part1_test = solve_part1(data)
     assert part1_test == 3749
-    part1_result = solve_part1(input_file)
+    part1_result = solve_part1(input_file, cache=cache)
     print(f"Part 1: {part1_result}")
     assert part1_result == 5837374519342
 
     part2_test = solve_part2(data)
     assert part2_test == 11387
-    part2_result = solve_part2(input_file)
+    part2_result = solve_part2(input_file, cache=cache)
     print(f"Part 2: {part2_result}")
     assert part2_result == 492383931650959
+    assert solve_part2(input_file, method="forward") == part2_result
+
+    for ops, result in (([add, mul], part1_result), ([add, mul, concat], part2_result)):
+        parallel_result = solve_parallel(input_file, ops)
+        print(f"Parallel ({len(ops)} ops): {parallel_result}")
+        assert parallel_result == result
 
 
 if __name__ == "__main__":
@@ -1,93 +1,87 @@
+import sys
 from collections import defaultdict
-from math import gcd
 from pathlib import Path
 
+import numpy as np
 
-def parse_map(grid):
-    antennas = defaultdict(list)
-    for y, row in enumerate(grid):
-        for x, char in enumerate(row):
-            if char not in ".#":
-                antennas[char].append((x, y))
-    return antennas
+sys.path.append(str(Path(__file__).parent.parent))
 
+from aoc_grid import Grid  # noqa: E402
 
-def find_antinodes(antennas, width, height):
-    antinodes = set()
+NOT_ANTENNAS = b".#\n"
 
-    for freq, positions in antennas.items():
-        n = len(positions)
-        for i in range(n):
-            for j in range(i + 1, n):
-                x1, y1 = positions[i]
-                x2, y2 = positions[j]
 
-                # calculate the distance between the two antennas
-                dx, dy = x2 - x1, y2 - y1
+def parse_map(grid: Grid):
+    antennas = defaultdict(list)
+    for i, char in enumerate(grid.cells):
+        if char not in NOT_ANTENNAS:
+            y, x = grid.position(i)
+            antennas[chr(char)].append((x, y))
+    return antennas
 
-                # antinodes in both directions
-                antinode1 = (x1 - dx, y1 - dy)
-                antinode2 = (x2 + dx, y2 + dy)
 
-                # only add antinodes that are within the grid
-                if 0 <= antinode1[0] < width and 0 <= antinode1[1] < height:
-                    antinodes.add(antinode1)
-                if 0 <= antinode2[0] < width and 0 <= antinode2[1] < height:
-                    antinodes.add(antinode2)
+def _antenna_pairs(positions) -> tuple[np.ndarray, np.ndarray]:
+    """Every pair of same frequency antennas as two (pairs, 2) x, y arrays."""
+    positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+    first, second = np.triu_indices(len(positions), k=1)
+    return positions[first], positions[second]
 
-    return antinodes
+
+def _mark(antinodes: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Mark the points inside the grid, return which ones were inside."""
+    height, width = antinodes.shape
+    x, y = points[:, 0], points[:, 1]
+    inside = (0 <= x) & (x < width) & (0 <= y) & (y < height)
+    antinodes[y[inside], x[inside]] = True
+    return inside
 
 
-def find_antinodes_part2(antennas, width, height):
-    antinodes = set()
+def find_antinodes(antennas, width, height) -> np.ndarray:
+    antinodes = np.zeros((height, width), dtype=bool)
 
-    for freq, positions in antennas.items():
-        n = len(positions)
-        for i in range(n):
-            for j in range(i + 1, n):
-                x1, y1 = positions[i]
-                x2, y2 = positions[j]
+    for positions in antennas.values():
+        first, second = _antenna_pairs(positions)
+        distance = second - first
+        # antinodes in both directions
+        _mark(antinodes, first - distance)
+        _mark(antinodes, second + distance)
 
-                # calculate the distance between the two antennas
-                dx, dy = x2 - x1, y2 - y1
+    return antinodes
 
-                # take the lowest common multiple of dx and dy
-                step = gcd(dx, dy)
-                step_x, step_y = dx // step, dy // step
 
-                # now we have to fill the whole grid line with antinodes
+def find_antinodes_part2(antennas, width, height) -> np.ndarray:
+    antinodes = np.zeros((height, width), dtype=bool)
 
-                # step backwards
-                cur_x, cur_y = x1, y1
-                while 0 <= cur_x < width and 0 <= cur_y < height:
-                    antinodes.add((cur_x, cur_y))
-                    cur_x -= step_x
-                    cur_y -= step_y
+    for positions in antennas.values():
+        first, second = _antenna_pairs(positions)
+        distance = second - first
+        # smallest grid step along the line through both antennas
+        step = distance // np.gcd(distance[:, :1], distance[:, 1:])
 
-                # step forwards
-                cur_x, cur_y = x1 + step_x, y1 + step_y
-                while 0 <= cur_x < width and 0 <= cur_y < height:
-                    antinodes.add((cur_x, cur_y))
-                    cur_x += step_x
-                    cur_y += step_y
+        # walk all lines at once in both directions, a line that left the
+        # grid never comes back so it is dropped
+        for direction in (step, -step):
+            points = first
+            while len(points):
+                inside = _mark(antinodes, points)
+                direction = direction[inside]
+                points = points[inside] + direction
 
     return antinodes
 
 
 def solve_part1(data: str) -> int:
-    grid = [list(row) for row in data.splitlines()]
-    width, height = len(grid[0]), len(grid)
+    grid = Grid(data)
     antennas = parse_map(grid)
-    antinodes = find_antinodes(antennas, width, height)
-    return len(antinodes)
+    antinodes = find_antinodes(antennas, grid.width, grid.height)
+    return int(antinodes.sum())
 
 
 def solve_part2(data: str) -> int:
-    grid = [list(row) for row in data.splitlines()]
-    width, height = len(grid[0]), len(grid)
+    grid = Grid(data)
     antennas = parse_map(grid)
-    antinodes = find_antinodes_part2(antennas, width, height)
-    return len(antinodes)
+    antinodes = find_antinodes_part2(antennas, grid.width, grid.height)
+    return int(antinodes.sum())
 
 
 def main():
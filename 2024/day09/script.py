@@ -1,119 +1,146 @@
-from collections import deque
-from itertools import chain
+from heapq import heappop, heappush
 from pathlib import Path
-from typing import Iterable
+from typing import BinaryIO, NamedTuple
 
+# a single digit in the disk map = at most 9 blocks per file or gap, only
+# gaps around empty files add up to more
+MAX_SPAN = 9
+# ascii digits to block counts, whitespace is dropped
+BLOCK_COUNTS = bytes.maketrans(b"0123456789", bytes(range(10)))
+WHITESPACE = b" \t\r\n"
+READ_SIZE = 1 << 16
 
-def create_blocks(data: str) -> list[str]:
-    idx = 0
-    s = []
-    for i, c in enumerate(data):
-        d = int(c)
-        if i % 2 == 0:  # file
-            for _ in range(d):
-                s.append(str(idx))
-            idx += 1
-        else:  # free space
-            for _ in range(d):
-                s.append(".")
-    return s
-
-
-def calc_checksum(compact: Iterable[int | str]) -> int:
-    return sum(
-        count * int(digit) for count, digit in enumerate(compact) if digit != "."
-    )
-
-
-def backfill_part1(blocks: list[str]) -> list[int]:
-    copy = deque(blocks)
-
-    num_dots = blocks.count(".")
-    num_digits = len(blocks) - num_dots
-
-    ret = []
-    for b in blocks:
-        if b == ".":
-            while True:
-                s = copy.pop()
-                if s != ".":
-                    break
-            digit = int(s)
-        else:
-            digit = int(b)
-
-        ret.append(digit)
 
-        if len(ret) == num_digits:
-            break
+class Span(NamedTuple):
+    start: int
+    length: int
+    file_id: int
 
-    return ret
 
-
-def chunkify(blocks: list[str]) -> list[list[str]]:
+def parse_spans(data: str) -> tuple[list[Span], list[list[int]]]:
+    """
+    Split the disk map into file spans and per-size min-heaps holding the
+    start positions of the free gaps (index = gap size).
+    """
     files = []
-    file: list[str] = []
-    last_file = "0"
-    for b in blocks:
-        if b != last_file:
-            files.append(file)
-            file = []
-            last_file = b
-        file.append(b)
-    files.append(file)
-    return files
-
-
-def backfill_part2(blocks: list[str]) -> Iterable[str]:
-    chunks = chunkify(blocks)
-    copy = chunks.copy()
-    while True:
-        try:
-            chunk = chunks.pop()
-        except IndexError:
-            break
-        index = copy.index(chunk)
-        if "." in chunk:
+    gaps: list[list[int]] = [[] for _ in range(MAX_SPAN + 1)]
+    position = free_start = 0
+    for i, c in enumerate(data):
+        d = int(c)
+        if i % 2 == 0:  # file
+            files.append(Span(position, d, i // 2))
+            # empty files don't split the free space around them
+            if d:
+                if gap := position - free_start:
+                    while len(gaps) <= gap:
+                        gaps.append([])
+                    # positions only grow, so appending keeps the heaps valid
+                    gaps[gap].append(free_start)
+                free_start = position + d
+        position += d
+    return files, gaps
+
+
+def compact_files(data: str) -> list[Span]:
+    files, gaps = parse_spans(data)
+    moved = []
+    for file in reversed(files):
+        # leftmost gap the file fits in, it has to be left of the file as well
+        best_size, best_start = 0, file.start
+        for size in range(file.length, len(gaps)):
+            if gaps[size] and gaps[size][0] < best_start:
+                best_size, best_start = size, gaps[size][0]
+
+        if not best_size:
+            moved.append(file)
             continue
-        for i, c in enumerate(chunks):
-            if "." not in c:
-                continue
-            if len(chunk) <= c.count("."):
-                start = c.index(".")
-                end = start + len(chunk)
-                copy[i][start:end] = chunk
-                copy[index] = ["."] * len(chunk)
-                break
 
-    return chain(*copy)
+        heappop(gaps[best_size])
+        if remaining := best_size - file.length:
+            heappush(gaps[remaining], best_start + file.length)
+        moved.append(file._replace(start=best_start))
+
+    return moved
+
+
+def span_checksum(span: Span) -> int:
+    # sum of position * file id over the span, without expanding its blocks
+    start, length, file_id = span
+    return file_id * (length * start + length * (length - 1) // 2)
+
+
+def read_disk_map(f: BinaryIO, read_size: int = READ_SIZE) -> bytearray:
+    """Read the dense disk map in chunks into one block count per byte."""
+    disk = bytearray()
+    while chunk := f.read(read_size):
+        disk += chunk.translate(BLOCK_COUNTS, WHITESPACE)
+    return disk
+
+
+def checksum_part1(disk: bytes | bytearray) -> int:
+    """
+    Move blocks from the end into the leftmost gaps with two pointers over the
+    dense map, adding to the checksum as blocks get their final position.
+    """
+    if not disk:
+        return 0
+
+    left, right = 0, (len(disk) - 1) // 2 * 2  # right always points at a file
+    right_blocks = disk[right]  # blocks of the right file not moved yet
+    position = checksum = 0
+
+    while left < right:
+        if left % 2 == 0:  # file stays where it is
+            length = disk[left]
+            checksum += span_checksum(Span(position, length, left // 2))
+            position += length
+        else:  # gap, fill it from the right
+            gap = disk[left]
+            while gap and left < right:
+                moved = min(gap, right_blocks)
+                checksum += span_checksum(Span(position, moved, right // 2))
+                position += moved
+                gap -= moved
+                right_blocks -= moved
+                if not right_blocks:
+                    right -= 2
+                    right_blocks = disk[right]
+        left += 1
+
+    # both pointers met on a file that was (partly) moved already
+    if left == right:
+        checksum += span_checksum(Span(position, right_blocks, right // 2))
+
+    return checksum
 
 
 def solve_part1(data: str) -> int:
-    blocks = create_blocks(data)
-    compact = backfill_part1(blocks)
-    checksum = calc_checksum(compact)
-    return checksum
+    return checksum_part1(data.encode().translate(BLOCK_COUNTS, WHITESPACE))
+
+
+def solve_part1_file(path: Path) -> int:
+    with open(path, "rb") as f:
+        return checksum_part1(read_disk_map(f))
 
 
 def solve_part2(data: str) -> int:
     """Solve part 2 of the problem."""
-    blocks = create_blocks(data)
-    compact = backfill_part2(blocks)
-    checksum = calc_checksum(compact)
-    return checksum
+    return sum(span_checksum(span) for span in compact_files(data))
 
 
 def main():
     data = """
 2333133121414131402
 """.strip()
-    input_file = (Path(__file__).parent / "input.txt").read_text().strip()
+    input_path = Path(__file__).parent / "input.txt"
+    input_file = input_path.read_text().strip()
 
     part1_test = solve_part1(data)
     assert part1_test == 1928
     part1_result = solve_part1(input_file)
     print(f"Part 1: {part1_result}")
     assert part1_result == 6421128769094
+    assert solve_part1_file(input_path) == part1_result
 
     part2_test = solve_part2(data)
     assert part2_test == 2858
@@ -1,75 +1,62 @@
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
 
-def str_to_grid(data: str) -> list[list[int]]:
-    return [[int(c) for c in row] for row in data.strip().splitlines()]
+from aoc_grid import Grid  # noqa: E402
 
+TRAILHEAD = 0
+SUMMIT = 9
+# summits reachable from a cell lie within 9 rows and columns of it, so
+# numbering them by (row, col) modulo 19 never collides within one bitset
+WINDOW = 2 * (SUMMIT - TRAILHEAD) + 1
 
-def find_paths(grid, x, y, current_value, visited, endpoints):
+
+def str_to_grid(data: str) -> Grid:
+    return Grid(data.strip())
+
+
+def rate_trailheads(grid: Grid) -> tuple[int, int]:
     """
-    Finding all possible paths in grid = DFS algorithm
+    Dynamic programming from the summits down, one height level at a time.
+
+    Per cell we keep the bitset of summits it can reach (part 1) and the
+    number of distinct hiking trails to any summit (part 2). Only the level
+    above is needed to compute the next one, and only cells with a trail up
+    are stored, so a neighbour lookup doubles as the height and bounds check.
     """
-    rows, cols = len(grid), len(grid[0])
-
-    # out of bounds
-    if not (0 <= x < rows and 0 <= y < cols):
-        return 0
-    if (x, y) in visited:
-        return 0
-    # each step is +1 in value
-    if grid[x][y] != current_value + 1:
-        return 0
-    # destination reached
-    if grid[x][y] == 9:
-        endpoints.add((x, y))
-        return 1
-
-    visited.add((x, y))
-
-    # 4 possible directions
-    paths = (
-        find_paths(grid, x + 1, y, grid[x][y], visited, endpoints)
-        + find_paths(grid, x - 1, y, grid[x][y], visited, endpoints)
-        + find_paths(grid, x, y + 1, grid[x][y], visited, endpoints)
-        + find_paths(grid, x, y - 1, grid[x][y], visited, endpoints)
-    )
-
-    # backtrack
-    visited.remove((x, y))
-    return paths
+    reach, paths = {}, {}
+    for i in grid.find_all(str(SUMMIT)):
+        r, c = grid.position(i)
+        reach[i] = 1 << (r % WINDOW * WINDOW + c % WINDOW)
+        paths[i] = 1
+
+    for height in range(SUMMIT - 1, TRAILHEAD - 1, -1):
+        level_reach, level_paths = {}, {}
+        for i in grid.find_all(str(height)):
+            summits = count = 0
+            for offset in grid.offsets:
+                if (n := i + offset) in paths:
+                    summits |= reach[n]
+                    count += paths[n]
+            if count:
+                level_reach[i] = summits
+                level_paths[i] = count
+        reach, paths = level_reach, level_paths
+
+    score = sum(summits.bit_count() for summits in reach.values())
+    return score, sum(paths.values())
 
 
 def solve_part1(data: str) -> int:
-    grid = str_to_grid(data)
-    rows, cols = len(grid), len(grid[0])
-    trailhead_scores = []
-
-    for x in range(rows):
-        for y in range(cols):
-            if grid[x][y] == 0:
-                endpoints: set[tuple[int, int]] = set()
-                find_paths(grid, x, y, -1, set(), endpoints)
-                score = len(endpoints)
-                trailhead_scores.append(score)
-
-    return sum(trailhead_scores)
+    score, _ = rate_trailheads(str_to_grid(data))
+    return score
 
 
 def solve_part2(data: str) -> int:
     """Solve part 2 of the problem."""
-    grid = str_to_grid(data)
-    rows, cols = len(grid), len(grid[0])
-    trailhead_scores = []
-
-    for x in range(rows):
-        for y in range(cols):
-            if grid[x][y] == 0:
-                # for part 2 we can simply stop using unique
-                # endpoints to get all available paths
-                score = find_paths(grid, x, y, -1, set(), set())
-                trailhead_scores.append(score)
-
-    return sum(trailhead_scores)
+    _, rating = rate_trailheads(str_to_grid(data))
+    return rating
 
 
 def main():
@@ -1,109 +1,117 @@
-from collections import Counter, defaultdict
+import sys
+from array import array
 from pathlib import Path
 
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import aoc_grid  # noqa: E402
+
+UNLABELED = -1
+
 
 class Grid:
     def __init__(self, data: str):
-        self.grid = self._str_to_grid(data)
-        self._new_value = 0
-        self._regions: dict[int, list] = {}
-        self._area: Counter = Counter()
-        self._perimeter: Counter = Counter()
-
-    def _str_to_grid(self, data: str) -> list[list[str]]:
-        return [list(row) for row in data.splitlines()]
-
-    def _calc_perimeter_for_cell(self, cell: str, pos: tuple[int, int]) -> int:
-        i, j = pos
-        total = 0
-        for x, y in [(i - 1, j), (i, j + 1), (i + 1, j), (i, j - 1)]:
-            try:
-                if self.grid[x][y] != cell:
-                    total += 1
-            except IndexError:
-                total += 1
-        return total
+        self.grid = aoc_grid.Grid(data)
+        # compact region id per cell, UNLABELED for the newline column
+        self.labels = array("i", [UNLABELED]) * len(self.grid.cells)
+        # per region id
+        self._area: list[int] = []
+        self._perimeter: list[int] = []
+
+    def uniquify_regions(self):
+        """
+        Label the regions with a union-find in a single sweep: every plot is
+        merged with its west and north neighbour if they grow the same plant,
+        carrying area and perimeter along to the new root.
+        """
+        stride = self.grid.stride
+        # a newline row above and below spares the bounds checks, the newline
+        # column already keeps east and west from wrapping
+        pad = bytes([aoc_grid.NEWLINE]) * stride
+        cells = pad + self.grid.cells + pad
+        size = len(cells)
+        parent = array("i", range(size))
+        area = array("i", [1]) * size
+        perimeter = array("i", [0]) * size
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]  # path halving
+                i = parent[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            i, j = find(i), find(j)
+            if i == j:
+                return
+            if area[i] < area[j]:
+                i, j = j, i
+            parent[j] = i
+            area[i] += area[j]
+            perimeter[i] += perimeter[j]
+
+        for i in range(stride, size - stride):
+            plant = cells[i]
+            if plant == aoc_grid.NEWLINE:
+                continue
+            n = cells[i - stride] == plant
+            e = cells[i + 1] == plant
+            s = cells[i + stride] == plant
+            w = cells[i - 1] == plant
+            perimeter[i] = 4 - n - e - s - w
+            if w:
+                union(i, i - 1)
+            if n:
+                union(i, i - stride)
+
+        # second, cheap pass to hand out compact region ids
+        region_ids: dict[int, int] = {}
+        for i in self.grid.indices():
+            root = find(i + stride)
+            if root not in region_ids:
+                region_ids[root] = len(region_ids)
+                self._area.append(area[root])
+                self._perimeter.append(perimeter[root])
+            self.labels[i] = region_ids[root]
 
     def calc_area_and_perimeter(self) -> int:
-        for i in range(len(self.grid)):
-            for j in range(len(self.grid[0])):
-                cell = self.grid[i][j]
-                self._area[cell] += 1
-                self._perimeter[cell] += self._calc_perimeter_for_cell(cell, (i, j))
         return sum(
-            self._area[region] * self._perimeter[region]
-            for region in self._regions.keys()
+            area * perimeter for area, perimeter in zip(self._area, self._perimeter)
         )
 
-    def _count_sides(self, cells):
-        cells_set = set(cells)
-        vertical_sides, horizontal_sides = defaultdict(list), defaultdict(list)
-
-        for x, y in cells:
-            for x2, y2 in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-                # filters out internal edges
-                if (x2, y2) not in cells_set:
-                    if x2 != x:
-                        vertical_sides[(x, x2)].append(y)
-                    else:
-                        horizontal_sides[(y, y2)].append(x)
-
-        ret = 0
-        for sides in list(vertical_sides.values()) + list(horizontal_sides.values()):
-            sides.sort()
-            ret += (
-                sum([1 for i in range(len(sides) - 1) if sides[i + 1] - sides[i] > 1])
-                + 1
-            )
-
-        return ret
-
-    def calc_cost_of_sides(self) -> int:
-        total = 0
-        for region, cells in self._regions.items():
-            total += len(cells) * self._count_sides(cells)
-        return total
-
-    def uniquify_regions(self):
-        for i in range(len(self.grid)):
-            for j in range(len(self.grid[0])):
-                # skip cells that are already labeled
-                if str(self.grid[i][j]).isdigit():
-                    continue
-                cells = self._flood_recursive(i, j, self._new_value)
-                self._regions[self._new_value] = cells
-                self._new_value += 1
-
-    def _flood_recursive(
-        self, start_x: int, start_y: int, new_value: int
-    ) -> list[tuple[int, int]]:
+    def count_corners(self) -> np.ndarray:
         """
-        Perform flood fill starting at (start_x, start_y) and replace the region
-        with `new_value`.
-        Good example: https://lvngd.com/blog/flood-fill-algorithm-python/
+        Corners per region from 2x2 windows over the label grid. Each plot looks
+        at the window it shares with every diagonal neighbour: the corner is
+        convex when neither side neighbour is in its region, and concave when
+        both are but the diagonal one isn't.
         """
-        width = len(self.grid)
-        height = len(self.grid[0])
-        cells = []
+        labels = np.frombuffer(self.labels, dtype=np.int32)
+        labels = np.pad(
+            labels.reshape(self.grid.height, self.grid.stride), 1, constant_values=-1
+        )
+        height, width = labels.shape
+        region = labels[1:-1, 1:-1]
+
+        corners = np.zeros(region.shape, dtype=np.int64)
+        for dr, dc in ((-1, 1), (1, 1), (1, -1), (-1, -1)):
+            vertical = labels[1 + dr : height - 1 + dr, 1 : width - 1] == region
+            horizontal = labels[1 : height - 1, 1 + dc : width - 1 + dc] == region
+            diagonal = labels[1 + dr : height - 1 + dr, 1 + dc : width - 1 + dc]
+            convex = ~vertical & ~horizontal
+            concave = vertical & horizontal & (diagonal != region)
+            corners += convex | concave
+
+        plots = region >= 0
+        return np.bincount(
+            region[plots], weights=corners[plots], minlength=len(self._area)
+        ).astype(np.int64)
 
-        def _fill(x, y, start, new_value):
-            if self.grid[x][y] != start or self.grid[x][y] == new_value:
-                return
-            self.grid[x][y] = new_value
-            cells.append((x, y))
-            neighbors = [
-                (x - 1, y),
-                (x + 1, y),
-                (x, y - 1),
-                (x, y + 1),
-            ]
-            for nx, ny in neighbors:
-                if 0 <= nx < width and 0 <= ny < height:
-                    _fill(nx, ny, start, new_value)
-
-        start_cell = self.grid[start_x][start_y]
-        _fill(start_x, start_y, start_cell, new_value)
-        return cells
+    def calc_cost_of_sides(self) -> int:
+        # a region has as many sides as it has corners
+        return int(np.dot(self._area, self.count_corners()))
 
 
 def solve_part1(data: str) -> int:
@@ -115,7 +123,6 @@ def solve_part1(data: str) -> int:
 def solve_part2(data: str) -> int:
     grid = Grid(data)
     grid.uniquify_regions()
-    grid.calc_area_and_perimeter()
     return grid.calc_cost_of_sides()
 
 
@@ -1,27 +1,17 @@
-import time
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from functools import wraps
-from heapq import heappop, heappush
+import math
+import re
 from pathlib import Path
 from typing import NamedTuple
 
+import numpy as np
+
 MAX_PUSHES = 100
 COST_BTN_A = 3
 COST_BTN_B = 1
-
-
-def timeit(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        if kwargs.pop("timeit", True):
-            start = time.perf_counter()
-            result = func(*args, **kwargs)
-            print(f"{func.__name__} took {time.perf_counter() - start:.6f} seconds")
-            return result
-        else:
-            return func(*args, **kwargs)
-
-    return wrapper
+PRIZE_OFFSET = 10000000000000
+NUMBER = re.compile(r"\d+")
+# Cramer products are sums of two button * prize terms, times the token price
+INT64_HEADROOM = 2 * max(COST_BTN_A, COST_BTN_B)
 
 
 class Location(NamedTuple):
@@ -64,100 +54,194 @@ def parse_data(data: str, add_to_price=0) -> list[Machine]:
     return machines
 
 
-def optimal_button_presses(machine: Machine, max_pushes: int = MAX_PUSHES) -> int:
-    queue = []
-    heappush(queue, (0, Location(0, 0), [0] * len(machine.buttons)))
-    visited = set([(Location(0, 0), 0)])
-
-    while queue:
-        total_cost, current_loc, button_pushes = heappop(queue)
+def _extended_gcd(a: int, b: int) -> tuple[int, int, int]:
+    """Return (g, x, y) with a * x + b * y == g == gcd(a, b)."""
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b:
+        q, a, b = a // b, b, a % b
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    if a < 0:
+        return -a, -x0, -y0
+    return a, x0, y0
 
-        if current_loc == machine.prize:
-            return total_cost
 
-        for i, button in enumerate(machine.buttons):
-            if button_pushes[i] < max_pushes:
-                next_loc = Location(
-                    current_loc.x + button.move_to.x, current_loc.y + button.move_to.y
-                )
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
 
-                # skip if the next location is out of bounds
-                if next_loc.x > machine.prize.x or next_loc.y > machine.prize.y:
-                    continue
 
-                next_pushes = button_pushes[:]
-                next_pushes[i] += 1
-                next_cost = total_cost + button.cost
-
-                state = (next_loc, next_cost)
-                if state not in visited:
-                    visited.add(state)
-                    heappush(queue, (next_cost, next_loc, next_pushes))
-
-    return -1
-
-
-@timeit
-def solve_part1(data: str, timeit=True) -> int:
-    machines = parse_data(data)
-    return sum(
-        result
-        for machine in machines
-        if (result := optimal_button_presses(machine)) > 0
+def _k_interval(start: int, step: int, limit: int | None) -> tuple[float, float]:
+    """Range of k that keeps start + k * step within [0, limit]."""
+    if step == 0:
+        inside = start >= 0 and (limit is None or start <= limit)
+        return (-math.inf, math.inf) if inside else (math.inf, -math.inf)
+    if step > 0:
+        low = _ceil_div(-start, step)
+        high = math.inf if limit is None else (limit - start) // step
+    else:
+        low = -math.inf if limit is None else _ceil_div(start - limit, -step)
+        high = start // -step
+    return low, high
+
+
+def _collinear_presses(
+    ua: int, ub: int, target: int, cost_a: int, cost_b: int, max_pushes: int | None
+) -> tuple[int, int] | None:
+    """
+    Cheapest non-negative a, b with a * ua + b * ub == target when both buttons
+    move along the same line. The solutions are a0 + k * ub / g, b0 - k * ua / g
+    and the cost is linear in k, so the optimum sits at an end of the k range.
+    """
+    if ua == 0 and ub == 0:
+        return (0, 0) if target == 0 else None
+
+    g, x, y = _extended_gcd(ua, ub)
+    if target % g:
+        return None
+    a0, b0 = x * (target // g), y * (target // g)
+    step_a, step_b = ub // g, -ua // g
+
+    low_a, high_a = _k_interval(a0, step_a, max_pushes)
+    low_b, high_b = _k_interval(b0, step_b, max_pushes)
+    low, high = max(low_a, low_b), min(high_a, high_b)
+    if low > high:
+        return None
+
+    # presses are non-negative, so the cost can't fall towards an open end
+    k = low if cost_a * step_a + cost_b * step_b >= 0 else high
+    return a0 + int(k) * step_a, b0 + int(k) * step_b
+
+
+def button_presses(
+    machine: Machine, max_pushes: int | None = None
+) -> tuple[int, int] | None:
+    """
+    Presses of button A and B that reach the prize at the lowest cost, or None.
+
+    Independent buttons give exactly one candidate via Cramer's rule, collinear
+    ones fall back to the extended gcd along their shared line.
+    """
+    button_a, button_b = machine.buttons
+    ax, ay = button_a.move_to
+    bx, by = button_b.move_to
+    px, py = machine.prize
+
+    det = ax * by - ay * bx
+    if det:
+        a, a_rest = divmod(px * by - py * bx, det)
+        b, b_rest = divmod(ax * py - ay * px, det)
+        if a_rest or b_rest or a < 0 or b < 0:
+            return None
+        if max_pushes is not None and (a > max_pushes or b > max_pushes):
+            return None
+        return a, b
+
+    # buttons are collinear, the prize has to lie on their line as well
+    if ax * py - ay * px or bx * py - by * px:
+        return None
+    axis = 0 if ax or bx else 1
+    presses = _collinear_presses(
+        button_a.move_to[axis],
+        button_b.move_to[axis],
+        machine.prize[axis],
+        button_a.cost,
+        button_b.cost,
+        max_pushes,
+    )
+    if presses is None:
+        return None
+    a, b = presses
+    if (a * ax + b * bx, a * ay + b * by) != (px, py):
+        return None
+    return presses
+
+
+def machine_cost(machine: Machine, max_pushes: int | None = None) -> int:
+    """Tokens needed to win the prize, 0 if it can't be won."""
+    presses = button_presses(machine, max_pushes)
+    if presses is None:
+        return 0
+    button_a, button_b = machine.buttons
+    return presses[0] * button_a.cost + presses[1] * button_b.cost
+
+
+def _table(values: list[int]) -> np.ndarray:
+    columns = [max(map(abs, values[i::6]), default=0) for i in range(6)]
+    button, prize = max(columns[:4]), max(columns[4:])
+    # Python ints (object dtype) once the Cramer products could overflow int64
+    dtype = np.int64 if INT64_HEADROOM * max(button, prize) * button < 2**63 else object
+    return np.array(values, dtype=dtype).reshape(-1, 6)
+
+
+def parse_table(data: str, add_to_price=0) -> np.ndarray:
+    """Machines straight from the input as rows of ax, ay, bx, by, px, py."""
+    values = [int(value) for value in NUMBER.findall(data)]
+    if add_to_price:
+        # the last two of every six values are the prize
+        values = [
+            value + add_to_price if i % 6 >= 4 else value
+            for i, value in enumerate(values)
+        ]
+    return _table(values)
+
+
+def machine_array(machines: list[Machine]) -> np.ndarray:
+    return _table(
+        [
+            value
+            for (button_a, button_b), prize in machines
+            for value in (*button_a.move_to, *button_b.move_to, *prize)
+        ]
     )
 
 
-@timeit
-def solve_part1_parallel(data: str, timeit=True) -> int:
-    machines = parse_data(data)
-
-    with ProcessPoolExecutor() as executor:
-        results = executor.map(optimal_button_presses, machines)
+def _row_machine(row: np.ndarray) -> Machine:
+    ax, ay, bx, by, px, py = map(int, row)
+    button_a = Button("Button A", Location(ax, ay), COST_BTN_A)
+    button_b = Button("Button B", Location(bx, by), COST_BTN_B)
+    return Machine([button_a, button_b], Location(px, py))
 
-    return sum(result for result in results if result > 0)
 
+def batch_costs(table: np.ndarray, max_pushes: int | None = None) -> np.ndarray:
+    """
+    Cost per machine row, solved with Cramer's rule for all machines at once
+    using the standard token prices for button A and B.
+    """
+    ax, ay, bx, by, px, py = table.T
 
-@timeit
-def solve_part1_threaded(data: str, timeit=True) -> int:
-    machines = parse_data(data)
+    det = ax * by - ay * bx
+    independent = det != 0
+    safe_det = np.where(independent, det, 1)
+    a_num, b_num = px * by - py * bx, ax * py - ay * px
+    a, b = a_num // safe_det, b_num // safe_det
 
-    with ThreadPoolExecutor() as executor:
-        results = executor.map(optimal_button_presses, machines)
+    valid = independent & (a * safe_det == a_num) & (b * safe_det == b_num)
+    valid &= (a >= 0) & (b >= 0)
+    if max_pushes is not None:
+        valid &= (a <= max_pushes) & (b <= max_pushes)
+    costs = np.where(valid, a * COST_BTN_A + b * COST_BTN_B, 0)
 
-    return sum(result for result in results if result > 0)
+    # collinear buttons are rare, solve those one by one
+    for i in np.flatnonzero(~independent):
+        costs[i] = machine_cost(_row_machine(table[i]), max_pushes)
+    return costs
 
 
-def optimal_button_cost(button_a, button_b, prize):
-    ax, ay = button_a.move_to.x, button_a.move_to.y
-    bx, by = button_b.move_to.x, button_b.move_to.y
-    px, py = prize.x, prize.y
+def work_items(data: str) -> list[Machine]:
+    """Per machine work list for comparing executors, see aoc_pools.py."""
+    return parse_data(data)
 
-    # Solve for b (Button B presses) using elimination
-    b_presses = (px * ay - py * ax) // (ay * bx - by * ax)
-    # Solve for a (Button A presses) using the result of b
-    a_presses = (px * by - py * bx) // (by * ax - bx * ay)
 
-    # Validate the solution
-    if ax * a_presses + bx * b_presses == px and ay * a_presses + by * b_presses == py:
-        total_cost = 3 * a_presses + b_presses
-        return a_presses, b_presses, total_cost
-    else:
-        return None, None, None
+def solve_item(machine: Machine) -> int:
+    return machine_cost(machine, MAX_PUSHES)
 
 
-def solve_part2(data: str) -> int:
-    """Solve part 2 of the problem."""
-    machines = parse_data(data, add_to_price=10000000000000)
-    total_cost = 0
-
-    for machine in machines:
-        button_a, button_b = machine.buttons
-        a, b, cost = optimal_button_cost(button_a, button_b, machine.prize)
+def solve_part1(data: str) -> int:
+    return int(batch_costs(parse_table(data), MAX_PUSHES).sum())
 
-        if cost is not None:
-            total_cost += cost
 
-    return total_cost
+def solve_part2(data: str) -> int:
+    return int(batch_costs(parse_table(data, add_to_price=PRIZE_OFFSET)).sum())
 
 
 def main():
@@ -180,21 +264,13 @@ Prize: X=18641, Y=10279
 """.strip()
     input_file = (Path(__file__).parent / "input.txt").read_text().strip()
 
-    part1_test = solve_part1(data, timeit=False)
+    part1_test = solve_part1(data)
     assert part1_test == 480
 
     part1_result = solve_part1(input_file)
     print(f"Part 1: {part1_result}")
     assert part1_result == 29517
 
-    part1_result = solve_part1_threaded(input_file)
-    print(f"Part 1 (threaded): {part1_result}")
-    assert part1_result == 29517
-
-    part1_result = solve_part1_parallel(input_file)
-    print(f"Part 1 (parallel): {part1_result}")
-    assert part1_result == 29517
-
     part2_test = solve_part2(data)
     assert part2_test == 875318608908
     part2_result = solve_part2(input_file)
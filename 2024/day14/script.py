@@ -1,121 +1,124 @@
-from collections import defaultdict
-from dataclasses import dataclass
+from math import gcd
 from pathlib import Path
-from typing import NamedTuple
+
+import numpy as np
 
 NUM_SECONDS = 100
 TREE_BASE_THRESHOLD = 10
+# timesteps simulated per vectorised batch in part 2
+BATCH_SECONDS = 256
 
 
-class Position(NamedTuple):
-    x: int
-    y: int
-
-
-class Speed(NamedTuple):
-    x: int
-    y: int
-
-
-@dataclass
-class Robot:
-    speed: Speed
-    start: Position
-    current: Position
-
-    def move(self, grid_x: int, grid_y: int) -> None:
-        new_x = (self.current.x + self.speed.x) % grid_x
-        new_y = (self.current.y + self.speed.y) % grid_y
-        self.current = Position(new_x, new_y)
-
-
-def create_grid(x: int, y: int, fill: int = 0) -> list[list[int]]:
-    return [[fill for _ in range(x)] for _ in range(y)]
-
-
-def print_grid(grid: list[list[int]]) -> None:
-    for row in grid:
-        print(" | ".join(str(cell) for cell in row))
-    print()
-
-
-def parse_robots(data: str) -> list[Robot]:
+def parse_robots(data: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return (positions, speeds) as (n, 2) arrays of x, y pairs."""
     robots = []
     for line in data.strip().splitlines():
         p, v = line.split(" ")
         pp = p.split("=")[1].split(",")
         vv = v.split("=")[1].split(",")
+        robots.append([int(pp[0]), int(pp[1]), int(vv[0]), int(vv[1])])
+
+    arr = np.array(robots, dtype=np.int64).reshape(-1, 4)
+    return arr[:, :2], arr[:, 2:]
 
-        speed = Speed(x=int(vv[0]), y=int(vv[1]))
-        start = Position(x=int(pp[0]), y=int(pp[1]))
 
-        robot = Robot(speed, start, start)
-        robots.append(robot)
-    return robots
+def positions_at(
+    positions: np.ndarray, speeds: np.ndarray, seconds, x: int, y: int
+) -> np.ndarray:
+    """
+    Robot positions after `seconds`, computed in closed form as
+    (p + v * t) mod (x, y). Pass an array of timesteps to get a
+    (timesteps, robots, 2) array back.
+    """
+    t = np.asarray(seconds)[..., None, None]
+    return (positions + speeds * t) % np.array([x, y])
 
 
 def solve_part1(data: str, x: int, y: int) -> int:
     """Solve part 1 of the problem."""
-    grid = create_grid(x, y)
-    for robot in parse_robots(data):
-        for _ in range(NUM_SECONDS):
-            robot.move(x, y)
-        grid[robot.current.y][robot.current.x] += 1
+    positions, speeds = parse_robots(data)
+    cols, rows = positions_at(positions, speeds, NUM_SECONDS, x, y).T
 
     mid_row = y // 2
     mid_col = x // 2
 
     # exclude middle row and middle column
-    quadrant_1 = [row[:mid_col] for row in grid[:mid_row]]
-    quadrant_2 = [row[mid_col + 1 :] for row in grid[:mid_row]]
-    quadrant_3 = [row[:mid_col] for row in grid[mid_row + 1 :]]
-    quadrant_4 = [row[mid_col + 1 :] for row in grid[mid_row + 1 :]]
-
-    q1_sum = sum(c for row in quadrant_1 for c in row)
-    q2_sum = sum(c for row in quadrant_2 for c in row)
-    q3_sum = sum(c for row in quadrant_3 for c in row)
-    q4_sum = sum(c for row in quadrant_4 for c in row)
+    top, bottom = rows < mid_row, rows > mid_row
+    left, right = cols < mid_col, cols > mid_col
+
+    return int(
+        np.count_nonzero(top & left)
+        * np.count_nonzero(top & right)
+        * np.count_nonzero(bottom & left)
+        * np.count_nonzero(bottom & right)
+    )
+
+
+def _has_tree_base(occupied: np.ndarray) -> np.ndarray:
+    """
+    Per timestep, whether any row has more than TREE_BASE_THRESHOLD
+    robots side by side. `occupied` is a (timesteps, y, x) boolean array.
+    """
+    window = TREE_BASE_THRESHOLD + 1
+    counts = np.cumsum(occupied, axis=-1, dtype=np.int32)
+    counts = np.pad(counts, ((0, 0), (0, 0), (1, 0)))
+    in_window = counts[..., window:] - counts[..., :-window]
+    return (in_window == window).any(axis=(1, 2))
+
+
+def _least_spread_second(coords: np.ndarray, speeds: np.ndarray, size: int) -> int:
+    """
+    Second within one period of a single axis at which the robots are the most
+    bunched up, i.e. their coordinates along that axis have the lowest variance.
+    """
+    seconds = np.arange(size)[:, None]
+    return int(np.argmin(((coords + speeds * seconds) % size).var(axis=1)))
+
+
+def find_tree_by_variance(
+    positions: np.ndarray, speeds: np.ndarray, x: int, y: int
+) -> int:
+    """
+    The picture is where the robots cluster on both axes at once. Each axis
+    repeats on its own (every x resp. y seconds), so find the tightest second
+    per axis and combine them with the Chinese Remainder Theorem:
+    t = tx (mod x) and t = ty (mod y).
+    """
+    if gcd(x, y) != 1:
+        raise ValueError(f"Grid sizes {x} and {y} must be coprime")
+
+    tx = _least_spread_second(positions[:, 0], speeds[:, 0], x)
+    ty = _least_spread_second(positions[:, 1], speeds[:, 1], y)
+
+    second = tx + x * ((ty - tx) * pow(x, -1, y) % y)
+    # the puzzle counts from the first second, t = 0 is the same as one period
+    return second or x * y
+
+
+def find_tree_by_scanning(
+    positions: np.ndarray, speeds: np.ndarray, x: int, y: int
+) -> int:
+    # positions repeat after x * y seconds, so one period covers every state
+    period = x * y
+    for first in range(1, period + 1, BATCH_SECONDS):
+        seconds = np.arange(first, min(first + BATCH_SECONDS, period + 1))
+        cols, rows = np.moveaxis(positions_at(positions, speeds, seconds, x, y), -1, 0)
+
+        occupied = np.zeros((len(seconds), y, x), dtype=bool)
+        occupied[np.arange(len(seconds))[:, None], rows, cols] = True
+
+        found = np.flatnonzero(_has_tree_base(occupied))
+        if found.size:
+            return int(seconds[found[0]])
 
-    return q1_sum * q2_sum * q3_sum * q4_sum
-
-
-def _longest_consecutive(nums: list[int]) -> int:
-    max_streak = 0
-    current_streak = 0
-
-    for i in range(len(nums)):
-        if i == 0 or nums[i] == nums[i - 1] + 1:
-            current_streak += 1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 1
-
-    return max_streak
-
-
-def solve_part2(data: str, x: int, y: int) -> int:
-    robots = parse_robots(data)
-
-    active_rows: defaultdict[int, list[int]] = defaultdict(list)
-
-    for second in range(1, 1_000_001):
-        active_rows.clear()
-
-        for robot in robots:
-            robot.move(x, y)
-            row = robot.current.y
-            col = robot.current.x
+    return -1
 
-            active_rows[row].append(col)
 
-        for row, positions in active_rows.items():
-            positions.sort()  # sort to find consecutive robots
-            max_consecutive = _longest_consecutive(positions)
-            if max_consecutive > TREE_BASE_THRESHOLD:
-                print(f"Row {row} has {max_consecutive} consecutive robots.")
-                return second
-
-    return -1
+def solve_part2(data: str, x: int, y: int, use_variance: bool = True) -> int:
+    positions, speeds = parse_robots(data)
+    if use_variance:
+        return find_tree_by_variance(positions, speeds, x, y)
+    return find_tree_by_scanning(positions, speeds, x, y)
 
 
 def main():
@@ -145,6 +148,10 @@ p=9,5 v=-3,-3
     print(f"Part 2: {part2_result}")
     assert part2_result == 7383
 
+    part2_result = solve_part2(input_file, 101, 103, use_variance=False)
+    print(f"Part 2 (scanning): {part2_result}")
+    assert part2_result == 7383
+
 
 if __name__ == "__main__":
     main()
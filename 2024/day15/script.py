@@ -1,87 +1,84 @@
+import sys
 from dataclasses import dataclass
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from aoc_grid import Grid  # noqa: E402
+
+# index into Grid.offsets (north, east, south, west)
 MOVES = {
-    "^": (-1, 0),
-    "v": (1, 0),
-    "<": (0, -1),
-    ">": (0, 1),
+    "^": 0,
+    ">": 1,
+    "v": 2,
+    "<": 3,
 }
 
 
 @dataclass
 class Position:
-    r: int
-    c: int
+    i: int
     value: str
 
 
-def print_grid(grid: list[list[int]]) -> None:
-    for row in grid:
-        print(" | ".join(str(cell) for cell in row))
+def print_grid(grid: Grid) -> None:
+    for row in str(grid).splitlines():
+        print(" | ".join(row))
     print()
 
 
-def _find_robot(grid: list[list[str]], char: str = "@"):
-    for r in range(len(grid)):
-        for c in range(len(grid[0])):
-            if grid[r][c] == char:
-                return r, c
+def _find_robot(grid: Grid, char: str = "@") -> int:
+    return grid.find(char)
 
 
-def _trace_line(
-    grid: list[list[str]], start: tuple[int, int], direction: tuple[int, int]
-) -> list[Position]:
-    r, c = start
+def _trace_line(grid: Grid, start: int, direction: int) -> list[Position]:
+    i = start
     line = []
-    while 0 <= r < len(grid) and 0 <= c < len(grid[0]):
-        line.append(Position(r, c, grid[r][c]))
-        r += direction[0]
-        c += direction[1]
+    while grid.in_bounds(i):
+        line.append(Position(i, chr(grid[i])))
+        i += direction
     return line
 
 
-def _update_bot(
-    grid: list[list[str]], old_pos: tuple[int, int], new_pos: tuple[int, int]
-) -> None:
-    grid[old_pos[0]][old_pos[1]] = "."
-    grid[new_pos[0]][new_pos[1]] = "@"
+def _update_bot(grid: Grid, old_pos: int, new_pos: int) -> None:
+    grid[old_pos] = ord(".")
+    grid[new_pos] = ord("@")
 
 
-def _calc_value_boxes(grid: list[list[str]]) -> int:
+def _calc_value_boxes(grid: Grid) -> int:
     total = 0
-    for r in range(len(grid)):
-        for c in range(len(grid[0])):
-            if grid[r][c] == "O":
-                total += r * 100 + c
-            # part 2
-            elif grid[r][c] in "[]":
-                total += r * 50 + c / 2
+    for i in grid.indices():
+        r, c = grid.position(i)
+        if grid[i] == ord("O"):
+            total += r * 100 + c
+        # part 2
+        elif grid[i] in b"[]":
+            total += r * 50 + c / 2
     return total
 
 
 def _replace_cell_p2(cell: str) -> str:
     match cell:
         case "#":
-            return list("##")
+            return "##"
         case "O":
-            return list("[]")
+            return "[]"
         case ".":
-            return list("..")
+            return ".."
         case "@":
-            return list("@.")
+            return "@."
         case _:
             raise ValueError(f"Invalid cell: {cell}")
 
 
 def solve_part1(data: str) -> int:
     grid_str, instructions_str = data.split("\n\n")
-    grid = [list(row) for row in grid_str.splitlines()]
+    grid = Grid(grid_str)
     instructions = instructions_str.replace("\n", "")
     pos = _find_robot(grid)
 
     for instruction in instructions:
-        move = MOVES[instruction]
+        move = grid.offsets[MOVES[instruction]]
         line = _trace_line(grid, pos, move)
         all_chars = [p.value for p in line]
         wall = all_chars.index("#")
@@ -90,53 +87,53 @@ def solve_part1(data: str) -> int:
             continue
 
         if line[1].value == ".":
-            _update_bot(grid, pos, (line[1].r, line[1].c))
-            pos = (line[1].r, line[1].c)
+            _update_bot(grid, pos, line[1].i)
+            pos = line[1].i
             continue
 
         # boxes to move
         for i, box in enumerate(line[1:], start=1):
             if box.value in "O.":
-                grid[box.r][box.c] = line[i - 1].value
+                grid[box.i] = ord(line[i - 1].value)
                 if box.value == ".":
                     break
-        _update_bot(grid, pos, (line[1].r, line[1].c))
-        pos = (line[1].r, line[1].c)
+        _update_bot(grid, pos, line[1].i)
+        pos = line[1].i
 
     return _calc_value_boxes(grid)
 
 
-def _find_adjacent_boxes(
-    grid: list[list[str]], start: tuple[int, int], move: tuple[int, int]
-) -> list[tuple[int, int]]:
+def _find_adjacent_boxes(grid: Grid, start: int, move: int) -> list[int]:
     """Find all connected boxes ([]) horizontally from the next cell in the given direction."""
-    r, c = start[0] + move[0], start[1] + move[1]  # Move one step up or down
-    if not (0 <= r < len(grid) and 0 <= c < len(grid[0])) or grid[r][c] not in "[ ]":
+    i = start + move  # Move one step up or down
+    if not grid.in_bounds(i) or grid[i] not in b"[ ]":
         return []  # No box at the next position
 
-    boxes = [(r, c)]  # Add the starting box
+    boxes = [i]  # Add the starting box
 
-    # Look left
-    cl = c - 1
-    while cl >= 0 and grid[r][cl] in "[ ]":
-        boxes.append((r, cl))
-        cl -= 1
+    # Look left, the newline column stops us at the row edge
+    left = i - 1
+    while grid.in_bounds(left) and grid[left] in b"[ ]":
+        boxes.append(left)
+        left -= 1
 
     # Look right
-    cr = c + 1
-    while cr < len(grid[0]) and grid[r][cr] in "[ ]":
-        boxes.append((r, cr))
-        cr += 1
+    right = i + 1
+    while grid.in_bounds(right) and grid[right] in b"[ ]":
+        boxes.append(right)
+        right += 1
 
     return boxes
 
 
 def solve_part2(data: str) -> int:
     grid_str, instructions_str = data.split("\n\n")
-    grid = [
-        [ch for cell in row for ch in _replace_cell_p2(cell)]
-        for row in grid_str.splitlines()
-    ]
+    grid = Grid(
+        "\n".join(
+            "".join(_replace_cell_p2(cell) for cell in row)
+            for row in grid_str.splitlines()
+        )
+    )
     # print_grid(grid)
     instructions = instructions_str.replace("\n", "")
     pos = _find_robot(grid)
@@ -145,7 +142,7 @@ def solve_part2(data: str) -> int:
         print(instruction)
         print_grid(grid)
 
-        move = MOVES[instruction]
+        move = grid.offsets[MOVES[instruction]]
 
         lines = [_trace_line(grid, pos, move)]
         if instruction in ("^", "v"):
@@ -160,19 +157,19 @@ def solve_part2(data: str) -> int:
                 break
 
             if line[1].value == ".":
-                _update_bot(grid, pos, (line[1].r, line[1].c))
-                pos = (line[1].r, line[1].c)
+                _update_bot(grid, pos, line[1].i)
+                pos = line[1].i
                 break
 
             # boxes to move
             for i, box in enumerate(line[1:], start=1):
                 if box.value in "[].":
-                    grid[box.r][box.c] = line[i - 1].value
+                    grid[box.i] = ord(line[i - 1].value)
                     if box.value == ".":
                         break
 
-            _update_bot(grid, pos, (line[1].r, line[1].c))
-            pos = (line[1].r, line[1].c)
+            _update_bot(grid, pos, line[1].i)
+            pos = line[1].i
 
     return _calc_value_boxes(grid)
 
@@ -1,79 +1,274 @@
 import heapq
+import sys
+from collections import deque
+from collections.abc import Iterator
+from functools import partial
 from pathlib import Path
+from typing import NamedTuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from aoc_grid import NEWLINE, Grid  # noqa: E402
 
 START_POS = "S"
 END_POS = "E"
-START_DIRECTION = "right"
+WALL = ord("#")
+# states are cell * 4 + direction, directions in the order of Grid.offsets
+NORTH, EAST, SOUTH, WEST = range(4)
+START_DIRECTION = EAST
+STEP_COST = 1
+TURN_COST = 1000
+UNREACHED = -1
+# indexed by whether the move turns
+MOVE_COSTS = (STEP_COST, STEP_COST + TURN_COST)
 
 
-def _find_position(grid, target):
-    for i, row in enumerate(grid):
-        for j, cell in enumerate(row):
-            if cell == target:
-                return (i, j)
-    return None
+class Route(NamedTuple):
+    cost: int
+    # end states reached at the cheapest cost
+    ends: list[int]
+    # state -> states it is cheapest reached from
+    predecessors: dict[int, list[int]]
+    expanded: int
 
 
-def calculate_cheapest_route(
-    grid, start=None, end=None, initial_direction: str = START_DIRECTION
-) -> int:
+class Search(NamedTuple):
+    cost: int
+    expanded: int
+
+
+QUEUES = ("heap", "buckets")
+
+
+def _moves(grid: Grid, state: int) -> Iterator[tuple[int, int]]:
+    """Next states with their cost, a turn is always combined with a step."""
+    i, direction = divmod(state, 4)
+    for new_direction, offset in enumerate(grid.offsets):
+        n = i + offset
+        if 0 <= n < len(grid.cells) and grid[n] != WALL and grid[n] != NEWLINE:
+            yield n * 4 + new_direction, MOVE_COSTS[new_direction != direction]
+
+
+def _reverse_moves(grid: Grid, state: int) -> Iterator[tuple[int, int]]:
+    """States that move into state, with the cost of that move."""
+    i, direction = divmod(state, 4)
+    previous = i - grid.offsets[direction]
+    if 0 <= previous < len(grid.cells) and grid[previous] not in (WALL, NEWLINE):
+        for old_direction in range(4):
+            yield previous * 4 + old_direction, MOVE_COSTS[old_direction != direction]
+
+
+def _endpoints(grid: Grid, start: int | None, end: int | None) -> tuple[int, int]:
     if start is None:
-        start = _find_position(grid, START_POS)
+        start = grid.find(START_POS)
     if end is None:
-        end = _find_position(grid, END_POS)
+        end = grid.find(END_POS)
+    return start, end
+
+
+def calculate_cheapest_route(
+    grid: Grid,
+    start=None,
+    end=None,
+    initial_direction: int = START_DIRECTION,
+    queue: str = "heap",
+) -> Route:
+    """
+    Dijkstra over integer states with a flat distance array. Only predecessor
+    edges are kept, every cheapest path can be walked back from the ends.
+
+    There are only two move costs, so queue="buckets" swaps the heap for a
+    Dial style bucket queue: one FIFO per move cost. Costs are popped in
+    order, so each FIFO stays sorted and popping only compares two heads.
+    """
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown queue {queue!r}, expected one of {QUEUES}")
+    buckets = queue == "buckets"
 
-    rows, cols = len(grid), len(grid[0])
-    directions = {"up": (-1, 0), "left": (0, -1), "down": (1, 0), "right": (0, 1)}
+    start, end = _endpoints(grid, start, end)
+    cells, offsets, size = grid.cells, grid.offsets, len(grid.cells)
+    source = start * 4 + initial_direction
+    distances = [UNREACHED] * (size * 4)
+    distances[source] = 0
+    predecessors: dict[int, list[int]] = {}
+    heap = [] if buckets else [(0, source)]
+    steps, turns = deque([(0, source)] if buckets else []), deque()
+    cheapest = UNREACHED
+    expanded = 0
 
-    pq = [(0, start[0], start[1], initial_direction, [start])]
-    visited = {}
+    while heap or steps or turns:
+        if not buckets:
+            cost, state = heapq.heappop(heap)
+        elif turns and (not steps or turns[0] < steps[0]):
+            cost, state = turns.popleft()
+        else:
+            cost, state = steps.popleft()
+        if cost > distances[state]:
+            continue
+        if cheapest != UNREACHED and cost > cheapest:
+            break
+        if state // 4 == end:
+            cheapest = cost
+            continue
+
+        expanded += 1
+        # _moves inlined, this loop is hot
+        i, direction = divmod(state, 4)
+        for new_direction, offset in enumerate(offsets):
+            n = i + offset
+            if not 0 <= n < size or cells[n] == WALL or cells[n] == NEWLINE:
+                continue
+            move_cost = MOVE_COSTS[new_direction != direction]
+            next_state, new_cost = n * 4 + new_direction, cost + move_cost
+            known = distances[next_state]
+            if known == UNREACHED or new_cost < known:
+                distances[next_state] = new_cost
+                predecessors[next_state] = [state]
+                if not buckets:
+                    heapq.heappush(heap, (new_cost, next_state))
+                elif move_cost == STEP_COST:
+                    steps.append((new_cost, next_state))
+                else:
+                    turns.append((new_cost, next_state))
+            elif new_cost == known:
+                predecessors[next_state].append(state)
+
+    if cheapest == UNREACHED:
+        return Route(UNREACHED, [], predecessors, expanded)
+    ends = [end * 4 + d for d in range(4) if distances[end * 4 + d] == cheapest]
+    return Route(cheapest, ends, predecessors, expanded)
 
-    while pq:
-        cost, x, y, current_dir, path = heapq.heappop(pq)
 
-        if (x, y) == end:
-            visited[(x, y)] = visited.get((x, y), []) + [(cost, path)]
+def _heuristic(grid: Grid, state: int, end: int) -> int:
+    """
+    Manhattan distance plus one turn unless the end lies straight ahead, which
+    never overestimates as every turn costs at least TURN_COST.
+    """
+    i, direction = divmod(state, 4)
+    (r, c), (end_r, end_c) = grid.position(i), grid.position(end)
+    dr, dc = end_r - r, end_c - c
+    distance = (abs(dr) + abs(dc)) * STEP_COST
+    if (dr, dc) == (0, 0):
+        return 0
+    straight_ahead = {
+        NORTH: dc == 0 and dr < 0,
+        EAST: dr == 0 and dc > 0,
+        SOUTH: dc == 0 and dr > 0,
+        WEST: dr == 0 and dc < 0,
+    }[direction]
+    return distance if straight_ahead else distance + TURN_COST
+
+
+def astar_route(
+    grid: Grid, start=None, end=None, initial_direction: int = START_DIRECTION
+) -> Search:
+    """Cheapest cost only, the first end state popped is the cheapest one."""
+    start, end = _endpoints(grid, start, end)
+    source = start * 4 + initial_direction
+    distances = [UNREACHED] * (len(grid.cells) * 4)
+    distances[source] = 0
+    queue = [(_heuristic(grid, source, end), 0, source)]
+    expanded = 0
+
+    while queue:
+        _, cost, state = heapq.heappop(queue)
+        if cost > distances[state]:
             continue
+        if state // 4 == end:
+            return Search(cost, expanded)
+
+        expanded += 1
+        for next_state, move_cost in _moves(grid, state):
+            new_cost = cost + move_cost
+            known = distances[next_state]
+            if known == UNREACHED or new_cost < known:
+                distances[next_state] = new_cost
+                estimate = new_cost + _heuristic(grid, next_state, end)
+                heapq.heappush(queue, (estimate, new_cost, next_state))
 
-        # If already visited with a lower or equal cost, skip
-        if (x, y, current_dir) in visited and cost > visited[(x, y, current_dir)][0][0]:
+    return Search(UNREACHED, expanded)
+
+
+def bidirectional_route(
+    grid: Grid, start=None, end=None, initial_direction: int = START_DIRECTION
+) -> Search:
+    """
+    Dijkstra from the start state and backwards from every end state at once,
+    always growing the side with the cheaper frontier. Once both frontiers
+    together cost at least the best meeting point found, that one is optimal.
+    """
+    start, end = _endpoints(grid, start, end)
+    source = start * 4 + initial_direction
+    targets = [end * 4 + d for d in range(4)]
+    forward = [UNREACHED] * (len(grid.cells) * 4)
+    backward = [UNREACHED] * (len(grid.cells) * 4)
+    forward[source] = 0
+    for target in targets:
+        backward[target] = 0
+    queues = [[(0, source)], [(0, target) for target in targets]]
+    sides = ((forward, backward, _moves), (backward, forward, _reverse_moves))
+    cheapest = 0 if start == end else UNREACHED
+    expanded = 0
+
+    while queues[0] and queues[1]:
+        if cheapest != UNREACHED and queues[0][0][0] + queues[1][0][0] >= cheapest:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        distances, other, moves = sides[side]
+        cost, state = heapq.heappop(queues[side])
+        if cost > distances[state]:
+            continue
+        # like the one way search, never walk on from the end
+        if side == 0 and state // 4 == end:
             continue
 
-        visited[(x, y, current_dir)] = visited.get((x, y, current_dir), []) + [
-            (cost, path)
-        ]
+        expanded += 1
+        for next_state, move_cost in moves(grid, state):
+            new_cost = cost + move_cost
+            known = distances[next_state]
+            if known == UNREACHED or new_cost < known:
+                distances[next_state] = new_cost
+                heapq.heappush(queues[side], (new_cost, next_state))
+                if other[next_state] != UNREACHED:
+                    total = new_cost + other[next_state]
+                    if cheapest == UNREACHED or total < cheapest:
+                        cheapest = total
 
-        for new_dir, (dx, dy) in directions.items():
-            nx, ny = x + dx, y + dy
+    return Search(cheapest, expanded)
 
-            if 0 <= nx < rows and 0 <= ny < cols and grid[nx][ny] != "#":
-                # turn is the move + turn cost = 1 + 1k
-                move_cost = 1 if new_dir == current_dir else 1001
-                new_cost = cost + move_cost
-                heapq.heappush(pq, (new_cost, nx, ny, new_dir, path + [(nx, ny)]))
 
-    return visited.get(end, [])
+COST_SEARCHES = {
+    "dijkstra": calculate_cheapest_route,
+    "dial": partial(calculate_cheapest_route, queue="buckets"),
+    "astar": astar_route,
+    "bidirectional": bidirectional_route,
+}
 
 
-def string_to_grid(data: str) -> list:
-    return [list(row) for row in data.split("\n")]
+def best_path_tiles(route: Route) -> set[int]:
+    """Cells on any cheapest path, found walking the predecessor DAG backwards."""
+    seen = set(route.ends)
+    stack = list(route.ends)
+    while stack:
+        for previous in route.predecessors.get(stack.pop(), ()):
+            if previous not in seen:
+                seen.add(previous)
+                stack.append(previous)
+    return {state // 4 for state in seen}
 
 
-def solve_part1(data: str) -> int:
+def string_to_grid(data: str) -> Grid:
+    return Grid(data)
+
+
+def solve_part1(data: str, method: str = "dijkstra") -> int:
     grid = string_to_grid(data)
-    return calculate_cheapest_route(grid)[0][0]
+    return COST_SEARCHES[method](grid).cost
 
 
-def solve_part2(data: str) -> int:
+def solve_part2(data: str, queue: str = "heap") -> int:
     grid = string_to_grid(data)
-    routes = calculate_cheapest_route(grid)
-    cheapest = routes[0][0]
-    all_coords = set()
-    for cost, coords in routes:
-        if cost > cheapest:
-            continue
-        all_coords.update(coords)
-    return len(all_coords)
+    return len(best_path_tiles(calculate_cheapest_route(grid, queue=queue)))
 
 
 def main():
@@ -88,6 +283,8 @@ def main():
     part1_result = solve_part1(input_file)
     print(f"Part 1: {part1_result}")
     assert part1_result == 105496
+    for method in ("astar", "bidirectional"):
+        assert solve_part1(input_file, method=method) == part1_result
 
     part2_test = solve_part2(data)
     assert part2_test == 45
@@ -96,6 +293,7 @@ def main():
     part2_result = solve_part2(input_file)
     print(f"Part 2: {part2_result}")
     assert part2_result == 524
+    assert solve_part2(input_file, queue="buckets") == part2_result
 
 
 if __name__ == "__main__":
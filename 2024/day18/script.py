@@ -1,77 +1,183 @@
+import sys
+from array import array
+from bisect import bisect_left
 from collections import deque
 from pathlib import Path
 
+import numpy as np
 
-def create_grid(x=70, y=70):
-    grid = []
-    for i in range(y):
-        grid.append(["." for j in range(x)])
-    return grid
+sys.path.append(str(Path(__file__).parent.parent))
+
+from aoc_grid import Grid  # noqa: E402
+
+FREE = ord(".")
+CORRUPTED = ord("#")
+
+
+def parse_bytes(data: str) -> list[tuple[int, int]]:
+    return [(int(x), int(y)) for x, y in (row.split(",") for row in data.splitlines())]
 
 
-def fill_grid(grid, coords):
+def create_grid(x=70, y=70) -> Grid:
+    return Grid.filled(x, y, ".")
+
+
+def fill_grid(grid: Grid, coords) -> Grid:
     for coord in coords:
         x, y = int(coord[0]), int(coord[1])
-        grid[y][x] = "#"
+        grid[grid.index(y, x)] = CORRUPTED
     return grid
 
 
-def print_grid(grid):
-    for row in grid:
+def print_grid(grid: Grid):
+    for row in str(grid).splitlines():
         print(" ".join(row))
 
 
-def shortest_path(grid, start=None, end=None):
-    rows, cols = len(grid), len(grid[0])
+def shortest_path(grid: Grid, start=None, end=None):
+    rows, cols = grid.height, grid.width
     if start is None:
         start = (0, 0)
     if end is None:
         end = (rows - 1, cols - 1)
 
-    directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+    start_idx, end_idx = grid.index(*start), grid.index(*end)
 
-    queue = deque([(start[0], start[1], 0)])
-    visited = set()
-    visited.add(start)
+    queue = deque([(start_idx, 0)])
+    visited = bytearray(len(grid.cells))
+    visited[start_idx] = 1
 
     while queue:
-        x, y, steps = queue.popleft()
-        if (x, y) == end:
+        i, steps = queue.popleft()
+        if i == end_idx:
             return steps
 
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if (
-                0 <= nx < rows
-                and 0 <= ny < cols
-                and (nx, ny) not in visited
-                and grid[nx][ny] == "."
-            ):
-                queue.append((nx, ny, steps + 1))
-                visited.add((nx, ny))
+        for n in grid.neighbours(i):
+            if not visited[n] and grid[n] == FREE:
+                queue.append((n, steps + 1))
+                visited[n] = 1
 
     return -1
 
 
+def blocking_byte_rescan(coords, grid_size: int, num_bytes: int) -> int | None:
+    grid = fill_grid(create_grid(x=grid_size, y=grid_size), coords[:num_bytes])
+    for t in range(num_bytes, len(coords)):
+        fill_grid(grid, [coords[t]])
+        if shortest_path(grid) == -1:
+            return t
+    return None
+
+
+def blocking_byte_union_find(coords, grid_size: int, num_bytes: int) -> int | None:
+    """
+    Drop every byte, then take them back out newest first while joining each
+    freed cell with its free neighbours. The byte whose removal connects start
+    and end again is the first one to block the way.
+    """
+    grid = create_grid(x=grid_size, y=grid_size)
+    cells = [grid.index(y, x) for x, y in coords]
+    # a cell only frees up again once its earliest byte is taken back out
+    first_fall = array("i", [-1]) * len(grid.cells)
+    for t in range(len(cells) - 1, -1, -1):
+        first_fall[cells[t]] = t
+        grid[cells[t]] = CORRUPTED
+    # like shortest_path, walking off the start works even if it's corrupted
+    start, end = grid.index(0, 0), grid.index(grid.height - 1, grid.width - 1)
+    grid[start] = FREE
+
+    parent = array("i", range(len(grid.cells)))
+    size = array("i", [1]) * len(grid.cells)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # path halving
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        i, j = find(i), find(j)
+        if i == j:
+            return
+        if size[i] < size[j]:
+            i, j = j, i
+        parent[j] = i
+        size[i] += size[j]
+
+    stride = grid.stride
+    for i in grid.indices():
+        if grid[i] == FREE:
+            # the newline column is never free, only south needs a bounds check
+            if grid[i + 1] == FREE:
+                union(i, i + 1)
+            if i + stride < len(grid.cells) and grid[i + stride] == FREE:
+                union(i, i + stride)
+
+    if find(start) == find(end):
+        return None
+
+    for t in range(len(cells) - 1, num_bytes - 1, -1):
+        i = cells[t]
+        if first_fall[i] != t:
+            continue
+        grid[i] = FREE
+        for n in grid.neighbours(i):
+            if grid[n] == FREE:
+                union(i, n)
+        if find(start) == find(end):
+            return t
+
+    # already cut off: like the other methods, blame the next byte to fall,
+    # or nothing if no bytes are left
+    return num_bytes if num_bytes < len(coords) else None
+
+
+def first_blocking_byte(coords, grid_size: int, num_bytes: int) -> int | None:
+    """
+    Binary search over the number of fallen bytes. Every cell remembers when
+    its first byte fell, so the grid after k bytes is a single vectorised
+    write (blocked iff fall time < k) followed by one BFS per probe.
+    """
+    empty = create_grid(x=grid_size, y=grid_size)
+    cells = np.array([empty.index(y, x) for x, y in coords], dtype=np.int64)
+    fall_time = np.full(len(empty.cells), len(coords), dtype=np.int64)
+    fallen, first = np.unique(cells, return_index=True)
+    fall_time[fallen] = first
+    template = np.frombuffer(empty.cells, dtype=np.uint8)
+
+    def blocked(k: int) -> bool:
+        cells = np.where(fall_time < k, CORRUPTED, template).astype(np.uint8)
+        return shortest_path(Grid(bytearray(cells.tobytes()))) == -1
+
+    # byte t blocks the way if the first t + 1 bytes do
+    counts = range(num_bytes + 1, len(coords) + 1)
+    found = bisect_left(counts, True, key=blocked)
+    return None if found == len(counts) else num_bytes + found
+
+
+BLOCKING_BYTE_METHODS = {
+    "rescan": blocking_byte_rescan,
+    "union-find": blocking_byte_union_find,
+    "bisect": first_blocking_byte,
+}
+
+
 def solve_part1(data: str, grid_size: int, num_bytes: int) -> int:
-    coords = [row.split(",") for row in data.splitlines()]
+    coords = parse_bytes(data)
     grid = create_grid(x=grid_size, y=grid_size)
     grid = fill_grid(grid, coords[:num_bytes])
     return shortest_path(grid)
 
 
-def solve_part2(data: str, grid_size: int, num_bytes: int) -> int:
-    coords = [row.split(",") for row in data.splitlines()]
-    grid = create_grid(x=grid_size, y=grid_size)
-    grid = fill_grid(grid, coords[:num_bytes])
-    bytes_left = iter(coords[num_bytes:])
-    while True:
-        byte = next(bytes_left, None)
-        grid = fill_grid(grid, [byte])
-        path = shortest_path(grid)
-        if path == -1:
-            return ",".join(byte)
-    return -1
+def solve_part2(
+    data: str, grid_size: int, num_bytes: int, method: str = "union-find"
+) -> str | int:
+    coords = parse_bytes(data)
+    blocking = BLOCKING_BYTE_METHODS[method](coords, grid_size, num_bytes)
+    if blocking is None:
+        return -1
+    x, y = coords[blocking]
+    return f"{x},{y}"
 
 
 def main():
@@ -90,6 +196,16 @@ def main():
     print(f"Part 2: {part2_result}")
     assert part2_result == "64,29"
 
+    for method in ("rescan", "bisect"):
+        part2_result = solve_part2(input_file, 71, 1024, method=method)
+        print(f"Part 2 ({method}): {part2_result}")
+        assert part2_result == "64,29"
+
+    # cut off by all the bytes already fallen, none left to blame
+    for method in BLOCKING_BYTE_METHODS:
+        all_bytes = len(data.splitlines())
+        assert solve_part2(data, 7, all_bytes, method=method) == -1
+
 
 if __name__ == "__main__":
     main()
@@ -1,70 +1,131 @@
+import sys
+from array import array
 from collections import deque
 from pathlib import Path
 
+import numpy as np
 
-def string_to_grid(data: str) -> list:
-    return [list(row) for row in data.split("\n")]
+sys.path.append(str(Path(__file__).parent.parent))
 
+from aoc_grid import Grid  # noqa: E402
 
-def _find_position(grid, target):
-    for i, row in enumerate(grid):
-        for j, cell in enumerate(row):
-            if cell == target:
-                return (i, j)
-    return None
+WALL = ord("#")
+UNREACHED = -1
+CHEAT_RADIUS = 2
+LONG_CHEAT_RADIUS = 20
 
 
-def bfs(grid, start, end, wall_breaker=False):
-    rows, cols = len(grid), len(grid[0])
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    visited = set()
-    queue = deque([(start[0], start[1], 0)])
+def string_to_grid(data: str) -> Grid:
+    return Grid(data)
 
-    while queue:
-        x, y, steps = queue.popleft()
 
-        if (x, y) == end:
-            return steps
+def bfs(grid: Grid, start: int) -> array:
+    """Steps from start to every cell on the track, UNREACHED elsewhere."""
+    distances = array("i", [UNREACHED]) * len(grid.cells)
+    distances[start] = 0
+    queue = deque([start])
+
+    while queue:
+        i = queue.popleft()
+        for n in grid.neighbours(i):
+            if distances[n] == UNREACHED and grid[n] != WALL:
+                distances[n] = distances[i] + 1
+                queue.append(n)
+
+    return distances
+
+
+def cheat_offsets(radius: int) -> list[tuple[int, int, int]]:
+    """Row, column offset and length of every cheat of at most radius steps."""
+    return [
+        (dr, dc, abs(dr) + abs(dc))
+        for dr in range(-radius, radius + 1)
+        for dc in range(-radius + abs(dr), radius - abs(dr) + 1)
+        if abs(dr) + abs(dc) > 1
+    ]
+
+
+def count_cheats(grid: Grid, radius: int, min_saving: int) -> int:
+    """
+    Distances from the start and to the end are computed once; a cheat from
+    track cell a to track cell b then takes from_start[a] + |a - b| + to_end[b]
+    steps, so every cheat is checked with a few lookups instead of a BFS.
+    """
+    start, end = grid.find("S"), grid.find("E")
+    from_start, to_end = bfs(grid, start), bfs(grid, end)
+    # cheats have to finish within this many steps to save enough
+    budget = from_start[end] - min_saving
+
+    # lay to_end out with radius unreached rows above and below and radius
+    # unreached columns on the right, so no cheat can leave it or wrap around
+    stride = grid.width + radius
+    padded = [UNREACHED] * (stride * (grid.height + 2 * radius))
+    for r in range(grid.height):
+        source, target = r * grid.stride, (r + radius) * stride
+        padded[target : target + grid.width] = to_end[source : source + grid.width]
+    offsets = [(dr * stride + dc, length) for dr, dc, length in cheat_offsets(radius)]
 
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
+    cheats = 0
+    for a in grid.indices():
+        if from_start[a] == UNREACHED:
+            continue
+        r, c = grid.position(a)
+        at = (r + radius) * stride + c
+        limit = budget - from_start[a]
+        for offset, length in offsets:
+            if 0 <= padded[at + offset] <= limit - length:
+                cheats += 1
+    return cheats
 
-            if not (0 <= nx < rows and 0 <= ny < cols) or (nx, ny) in visited:
-                continue
 
-            if grid[nx][ny] == "#":
-                continue
+def _distance_grid(grid: Grid, start: int) -> np.ndarray:
+    distances = np.frombuffer(bfs(grid, start), dtype=np.int32)
+    distances = distances.reshape(grid.height, grid.stride)[:, : grid.width].copy()
+    # longer than any path, so cheats touching unreached cells never pay off
+    distances[distances == UNREACHED] = len(grid.cells)
+    return distances
+
+
+def count_cheats_numpy(grid: Grid, radius: int, min_saving: int) -> int:
+    """
+    Same count as count_cheats, one offset at a time: shifting to_end by the
+    offset lines up the end of every cheat with its start in from_start, so a
+    single masked comparison counts all cheats of that offset.
+    """
+    start, end = grid.find("S"), grid.find("E")
+    from_start, to_end = _distance_grid(grid, start), _distance_grid(grid, end)
+    shortest = from_start[grid.position(end)]
+    if shortest == len(grid.cells):
+        # no track to cheat on, like count_cheats
+        return 0
+    budget = shortest - min_saving
+
+    height, width = from_start.shape
+    cheats = 0
+    for dr, dc, length in cheat_offsets(radius):
+        if abs(dr) >= height or abs(dc) >= width:
+            continue
+        starts = from_start[
+            max(0, -dr) : height - max(0, dr), max(0, -dc) : width - max(0, dc)
+        ]
+        ends = to_end[
+            max(0, dr) : height - max(0, -dr), max(0, dc) : width - max(0, -dc)
+        ]
+        cheats += np.count_nonzero(starts + ends <= budget - length)
+    return int(cheats)
 
-            visited.add((nx, ny))
-            queue.append((nx, ny, steps + 1))
 
-    return -1
+CHEAT_COUNTERS = {"python": count_cheats, "numpy": count_cheats_numpy}
 
 
-def solve_part1(data: str, min_saving: int = 100) -> int:
-    grid = string_to_grid(data)
-    start = _find_position(grid, "S")
-    end = _find_position(grid, "E")
-    baseline = bfs(grid, start, end)
-    rows, cols = len(grid), len(grid[0])
-    cheats = 0
-    # TODO: only break walls that are on the path
-    for x in range(rows):
-        for y in range(cols):
-            if grid[x][y] == "#":
-                # break the wall
-                grid[x][y] = "."
-                steps_with_break = bfs(grid, start, end)
-                gain = baseline - steps_with_break
-                if gain >= min_saving:
-                    cheats += 1
-                # reset
-                grid[x][y] = "#"
-    return cheats
+def solve_part1(data: str, min_saving: int = 100, method: str = "numpy") -> int:
+    counter = CHEAT_COUNTERS[method]
+    return counter(string_to_grid(data), CHEAT_RADIUS, min_saving)
 
 
-# def solve_part2(data: str) -> int:
-#     """Solve part 2 of the problem."""
+def solve_part2(data: str, min_saving: int = 100, method: str = "numpy") -> int:
+    counter = CHEAT_COUNTERS[method]
+    return counter(string_to_grid(data), LONG_CHEAT_RADIUS, min_saving)
 
 
 def main():
@@ -77,11 +138,11 @@ def main():
     print(f"Part 1: {part1_result}")
     assert part1_result == 1381
 
-    # part2_test = solve_part2(data)
-    # assert part2_test == 0
-    # part2_result = solve_part2(input_file)
-    # print(f"Part 2: {part2_result}")
-    # assert part2_result == 0
+    for method in CHEAT_COUNTERS:
+        part2_test = solve_part2(data, min_saving=50, method=method)
+        assert part2_test == 285
+    part2_result = solve_part2(input_file)
+    print(f"Part 2: {part2_result}")
 
 
 if __name__ == "__main__":